@@ -2,6 +2,8 @@
 
 import json
 import hashlib
+import os
+import tempfile
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
@@ -60,8 +62,15 @@ class CacheManager:
         }
         
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
+            # Write to a temp file and swap it in, so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{cache_key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(cache_data, f, indent=2)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
         except Exception:
             # If cache write fails, continue without cache
             pass
@@ -23,6 +23,9 @@ from .uploader import EvidenceUploader
 @click.option('--upload-method', type=click.Choice(['zip', 'individual']), default='zip', help='Upload method: zip (single file) or individual (file by file)')
 @click.option('--upload-auth-type', type=click.Choice(['bearer', 'sas', 'custom']), default='bearer', help='Authentication type for upload')
 @click.option('--upload-custom-header', help='Custom header name for authentication (if auth-type is custom)')
+@click.option('--upload-workers', envvar='EVIDENCE_UPLOAD_WORKERS', type=click.IntRange(min=1), default=8, help='Concurrent uploads for the individual upload method')
+@click.option('--upload-timeout', envvar='EVIDENCE_UPLOAD_TIMEOUT', type=click.FloatRange(min=0, min_open=True), default=60.0, help='Timeout in seconds for each individual file upload')
+@click.option('--upload-retries', envvar='EVIDENCE_UPLOAD_RETRIES', type=click.IntRange(min=0), default=3, help='Retries on connection errors and 502/503/504 responses')
 @click.option('--repo-name', envvar='BUILD_REPOSITORY_NAME', help='Repository name')
 @click.option('--commit-sha', envvar='BUILD_SOURCEVERSION', help='Commit SHA')
 @click.option('--build-id', envvar='BUILD_BUILDID', help='Build ID')
@@ -35,6 +38,7 @@ from .uploader import EvidenceUploader
 @click.option('--verbose', '-v', is_flag=True, help='Verbose output')
 def main(repo: str, out: str, upload_url: Optional[str], upload_token: Optional[str],
          upload_method: str, upload_auth_type: str, upload_custom_header: Optional[str],
+         upload_workers: int, upload_timeout: float, upload_retries: int,
          repo_name: Optional[str], commit_sha: Optional[str], build_id: Optional[str],
          snyk_token: Optional[str], openai_token: Optional[str], gemini_token: Optional[str],
          ai_provider: str, language: str, no_cache: bool, verbose: bool):
@@ -105,7 +109,8 @@ def main(repo: str, out: str, upload_url: Optional[str], upload_token: Optional[
         if verbose:
             click.echo("Running security analysis...")
         try:
-            security_analyzer = SecurityAnalyzer(str(repo_path), snyk_token=snyk_token, verbose=verbose)
+            security_analyzer = SecurityAnalyzer(str(repo_path), snyk_token=snyk_token, verbose=verbose,
+                                                 use_cache=not no_cache)
             security_info = security_analyzer.analyze(deps_info, stack_info)
             
             # Print debug logs if available
@@ -135,7 +140,7 @@ def main(repo: str, out: str, upload_url: Optional[str], upload_token: Optional[
         if verbose:
             click.echo("Running quality analysis (tests and coverage)...")
         try:
-            quality_analyzer = QualityAnalyzer(str(repo_path))
+            quality_analyzer = QualityAnalyzer(str(repo_path), use_cache=not no_cache)
             quality_info = quality_analyzer.analyze(stack_info)
             
             if verbose:
@@ -160,7 +165,7 @@ def main(repo: str, out: str, upload_url: Optional[str], upload_token: Optional[
         if verbose:
             click.echo("Collecting metrics for AI generation...")
         from .metrics_collector import MetricsCollector
-        metrics_collector = MetricsCollector(str(repo_path))
+        metrics_collector = MetricsCollector(str(repo_path), use_cache=not no_cache)
         metrics = metrics_collector.collect()
         
         # Generate summary for AI
@@ -237,7 +242,10 @@ def main(repo: str, out: str, upload_url: Optional[str], upload_token: Optional[
                     upload_url=upload_url,
                     upload_token=upload_token,
                     auth_type=upload_auth_type,
-                    custom_header=upload_custom_header
+                    custom_header=upload_custom_header,
+                    max_workers=upload_workers,
+                    request_timeout=upload_timeout,
+                    retry_total=upload_retries
                 )
                 
                 upload_result = uploader.upload(
@@ -70,7 +70,7 @@ class EvidenceGenerator:
         generated_files["repo_facts.json"] = str(facts_path)
         
         # Generate metrics
-        metrics_collector = MetricsCollector(str(self.repo_path))
+        metrics_collector = MetricsCollector(str(self.repo_path), use_cache=self.use_cache)
         metrics = metrics_collector.collect()
         metrics_path = self.output_dir / "metrics" / "cloc.json"
         with open(metrics_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,127 @@
+"""JSON helpers using orjson when available"""
+
+import io
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Union
+
+# Optional fast JSON backend
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# Optional streaming JSON parser
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+    ijson = None
+
+_SCALAR_EVENTS = frozenset(('string', 'number', 'boolean', 'null'))
+
+# Files at least this large are decoded straight from an mmap instead of a read() copy
+MMAP_MIN_BYTES = 64 * 1024
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from str, bytes or any buffer (e.g. an mmap).
+
+    Raises json.JSONDecodeError (orjson's error subclasses it) on invalid input.
+    """
+    if not isinstance(data, (str, bytes, bytearray, memoryview)):
+        # Release the view before returning so the buffer (e.g. an mmap) can be closed
+        with memoryview(data) as view:
+            return loads(view)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if not isinstance(data, str):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """Read and decode a JSON file (large files are mapped rather than copied into memory)"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            # Release the view explicitly: a decode error's traceback would otherwise keep
+            # it alive and the mmap could not be closed
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return loads(view)
+        return loads(f.read())
+
+
+def load_fields(fp: Any, keys: Iterable[str]) -> Dict[str, Any]:
+    """Read selected scalar fields from a JSON object in a binary file-like object or buffer.
+
+    Keys are ijson prefixes: top-level names, or dotted paths such as "summary.total".
+    With ijson the document is streamed and reading stops once every key has been
+    seen, so large sibling values are never built; without it the whole document
+    is decoded.
+    """
+    if not hasattr(fp, 'read'):
+        fp = io.BytesIO(bytes(fp))
+    wanted = set(keys)
+    if IJSON_AVAILABLE:
+        found = {}
+        try:
+            for prefix, event, value in ijson.parse(fp, use_float=True):
+                if prefix in wanted and event in _SCALAR_EVENTS:
+                    found[prefix] = value
+                    if len(found) == len(wanted):
+                        break
+        except ijson.JSONError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from e
+        return found
+
+    data = loads(fp.read())
+    found = {}
+    for key in wanted:
+        value = data
+        for part in key.split('.'):
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            if not isinstance(value, (dict, list)):
+                found[key] = value
+    return found
+
+
+def iter_items(path: Union[str, Path], prefix: str) -> Iterator[Any]:
+    """Yield the values at an ijson prefix of a JSON file, e.g. "runs.item.results.item".
+
+    Large files are streamed with ijson when available, so only one item is built
+    at a time; otherwise the file is decoded with load_file and the prefix walked.
+    Raises json.JSONDecodeError on invalid input.
+    """
+    with open(path, 'rb') as f:
+        if IJSON_AVAILABLE and os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            try:
+                yield from ijson.items(f, prefix, use_float=True)
+            except ijson.JSONError as e:
+                raise json.JSONDecodeError(str(e), "", 0) from e
+            return
+
+    values = [load_file(path)]
+    for part in prefix.split('.') if prefix else ():
+        if part == 'item':
+            values = [item for value in values if isinstance(value, list) for item in value]
+        else:
+            values = [value[part] for value in values if isinstance(value, dict) and part in value]
+    yield from values
+
+
+def dump_file(obj: Any, path: Union[str, Path]) -> None:
+    """Write obj to a file as JSON indented by two spaces (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, indent=2)
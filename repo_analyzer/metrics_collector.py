@@ -2,16 +2,109 @@
 
 import subprocess
 import os
+import re
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import json
 
+from .cache_manager import CacheManager
+
+
+logger = logging.getLogger(__name__)
+
+# Comment prefixes per language (single line and block markers)
+COMMENT_PATTERNS = {
+    'JavaScript': ['//', '/*', '*/', '*'],
+    'TypeScript': ['//', '/*', '*/', '*'],
+    'Python': ['#'],
+    'Java': ['//', '/*', '*/', '*'],
+    'C': ['//', '/*', '*/', '*'],
+    'C++': ['//', '/*', '*/', '*'],
+    'Go': ['//', '/*', '*/'],
+    'Rust': ['//', '/*', '*/'],
+    'Ruby': ['#'],
+    'PHP': ['//', '#', '/*', '*/'],
+    'Swift': ['//', '/*', '*/'],
+    'Kotlin': ['//', '/*', '*/'],
+    'Scala': ['//', '/*', '*/'],
+    'Shell': ['#'],
+    'HTML': ['<!--', '-->'],
+    'CSS': ['/*', '*/'],
+    'SCSS': ['//', '/*', '*/'],
+    'Sass': ['//', '/*', '*/'],
+    'SQL': ['--', '/*', '*/'],
+}
+
+
+# Files larger than this are sampled instead of read in full (generated bundles, dumps, ...)
+MAX_FILE_BYTES = 5 * 1024 * 1024
+# Size of the leading chunk used to estimate line counts of oversized files
+SAMPLE_BYTES = 1024 * 1024
+
+
+def _classify_lines(lines, prefixes: Tuple[str, ...]) -> Tuple[int, int, int]:
+    """Split an iterable of lines into (code, blank, comment) counts"""
+    code_lines = 0
+    blank_lines = 0
+    comment_lines = 0
+    
+    for line in lines:
+        stripped = line.strip()
+        
+        if not stripped:
+            blank_lines += 1
+        elif prefixes and stripped.startswith(prefixes):
+            comment_lines += 1
+        else:
+            code_lines += 1
+    
+    return code_lines, blank_lines, comment_lines
+
+
+def _count_file_lines_worker(path_str: str, lang: str) -> Tuple[str, int, int, int, bool]:
+    """Count code, blank and comment lines of a single file.
+    
+    Module-level so it can be pickled and run in a worker process. Files above
+    MAX_FILE_BYTES are estimated from their first SAMPLE_BYTES and flagged as sampled.
+    """
+    prefixes = tuple(COMMENT_PATTERNS.get(lang, []))
+    
+    try:
+        size = os.stat(path_str).st_size
+        if size > MAX_FILE_BYTES:
+            with open(path_str, 'rb') as f:
+                chunk = f.read(SAMPLE_BYTES)
+            if not chunk:
+                return lang, 0, 0, 0, True
+            
+            scale = size / len(chunk)
+            lines = chunk.decode('utf-8', errors='ignore').splitlines()
+            code_lines, blank_lines, comment_lines = _classify_lines(lines, prefixes)
+            return (
+                lang,
+                int(code_lines * scale),
+                int(blank_lines * scale),
+                int(comment_lines * scale),
+                True,
+            )
+        
+        with open(path_str, 'r', encoding='utf-8', errors='ignore') as f:
+            code_lines, blank_lines, comment_lines = _classify_lines(f, prefixes)
+    except Exception:
+        # If file can't be read, return zeros
+        return lang, 0, 0, 0, False
+    
+    return lang, code_lines, blank_lines, comment_lines, False
+
 
 class MetricsCollector:
     """Collects code metrics (lines of code, files, languages)"""
     
     # Common code file extensions (excluding non-code files like YAML, JSON, Markdown, HTML, Dockerfile, text)
-    CODE_EXTENSIONS = {
+    CODE_EXTENSIONS = frozenset({
         # JavaScript/TypeScript
         '.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs',
         # Python
@@ -44,22 +137,22 @@ class MetricsCollector:
         '.xml',
         # Config files (but not YAML/JSON)
         '.toml', '.ini', '.cfg', '.conf',
-    }
+    })
     
     # Files to exclude by name (case-insensitive)
-    EXCLUDE_FILENAMES = {
+    EXCLUDE_FILENAMES = frozenset({
         'dockerfile', 'docker-compose.yml', 'docker-compose.yaml',
         'makefile', 'rakefile',
-    }
+    })
     
     # Exclude by extension
-    EXCLUDE_EXTENSIONS = {
+    EXCLUDE_EXTENSIONS = frozenset({
         '.yaml', '.yml', '.json', '.html', '.htm', 
         '.md', '.markdown', '.txt', '.text',
-    }
+    })
     
     # Directories to ignore (dependencies and build artifacts)
-    IGNORE_DIRS = {
+    IGNORE_DIRS = frozenset({
         'node_modules', '.git', '__pycache__', '.venv', 'venv', 'env',
         'dist', 'build', '.next', '.nuxt', 'coverage', '.nyc_output',
         'target', 'bin', 'obj', '.idea', '.vscode', '.vs',
@@ -71,20 +164,146 @@ class MetricsCollector:
         'pods', '.cocoapods', 'DerivedData', 'Pods',
         '.gradle', '.mvn', 'gradle', 'maven',
         'jspm_packages', '.npm', '.yarn',
+    })
+    
+    # Extension to language name
+    LANGUAGE_MAP = {
+        '.js': 'JavaScript',
+        '.jsx': 'JavaScript',
+        '.mjs': 'JavaScript',
+        '.cjs': 'JavaScript',
+        '.ts': 'TypeScript',
+        '.tsx': 'TypeScript',
+        '.py': 'Python',
+        '.pyw': 'Python',
+        '.java': 'Java',
+        '.c': 'C',
+        '.cpp': 'C++',
+        '.cc': 'C++',
+        '.cxx': 'C++',
+        '.h': 'C/C++ Header',
+        '.hpp': 'C++ Header',
+        '.go': 'Go',
+        '.rs': 'Rust',
+        '.rb': 'Ruby',
+        '.php': 'PHP',
+        '.swift': 'Swift',
+        '.kt': 'Kotlin',
+        '.kts': 'Kotlin',
+        '.scala': 'Scala',
+        '.sh': 'Shell',
+        '.bash': 'Shell',
+        '.zsh': 'Shell',
+        '.css': 'CSS',
+        '.scss': 'SCSS',
+        '.sass': 'Sass',
+        '.less': 'Less',
+        '.sql': 'SQL',
+        '.xml': 'XML',
+        '.toml': 'TOML',
+        '.ini': 'INI',
+        '.cfg': 'Config',
+        '.conf': 'Config',
     }
     
-    def __init__(self, repo_path: str):
+    # Single anchored pattern matching any code file name (requires a non-empty stem)
+    _CODE_EXT_RE = re.compile(
+        r'.+\.(' + '|'.join(re.escape(ext.lstrip('.')) for ext in sorted(CODE_EXTENSIONS)) + r')\Z',
+        re.IGNORECASE,
+    )
+    
+    # Below this many files the process pool start-up cost outweighs the gain
+    PARALLEL_MIN_FILES = 200
+    
+    # Files counted between two progress snapshots of the streaming count
+    PROGRESS_BATCH_SIZE = 1000
+    
+    def __init__(self, repo_path: str, use_cache: bool = True):
         self.repo_path = Path(repo_path)
+        self.use_cache = use_cache
+        self.cache_manager = None
+        if use_cache:
+            try:
+                self.cache_manager = CacheManager()
+            except OSError:
+                # Cache directory not writable, continue without cache
+                self.cache_manager = None
     
     def collect(self) -> Dict[str, Any]:
         """Collect all metrics"""
-        # Try cloc first if available
+        cache_key = None
+        if self.cache_manager:
+            cache_key = self.cache_manager.get_cache_key("metrics", {
+                "repo_path": str(self.repo_path.resolve()),
+                "signature": self.signature(),
+            })
+            cached = self.cache_manager.get(cache_key)
+            if cached:
+                try:
+                    return json.loads(cached)
+                except ValueError:
+                    pass
+        
+        # Try cloc first if available, fallback to manual counting
+        result = self._try_cloc() or self._manual_count()
+        
+        if cache_key:
+            self.cache_manager.set(cache_key, json.dumps(result))
+        return result
+    
+    def signature(self) -> str:
+        """Signature of the files cloc may count: sorted relative paths with size and mtime_ns.
+        
+        Uses stat only (no file reads). Paths are part of the hash, so renames and
+        moves change it even when count, sizes and mtimes stay the same.
+        """
+        entries = []
+        for rel_path, entry in self._walk_signature_files():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append(f"{rel_path}\0{st.st_size}\0{st.st_mtime_ns}")
+        entries.sort()
+        
+        digest = hashlib.blake2b(digest_size=16)
+        for line in entries:
+            digest.update(line.encode('utf-8', 'surrogateescape'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+    
+    def _walk_signature_files(self) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Yield (relative path, DirEntry) for every file outside IGNORE_DIRS (any extension)"""
+        ignore_dirs = self.IGNORE_DIRS
+        stack = [(str(self.repo_path), "")]
+        while stack:
+            current, rel_dir = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in ignore_dirs:
+                                    stack.append((entry.path, rel_dir + entry.name + "/"))
+                                continue
+                        except OSError:
+                            continue
+                        yield rel_dir + entry.name, entry
+            except OSError:
+                # Directory vanished or is unreadable
+                continue
+    
+    def collect_iter(self) -> Iterator[Dict[str, Any]]:
+        """Collect metrics, yielding partial snapshots as they become available.
+        
+        The last snapshot yielded is the final result (same shape as collect()).
+        """
         cloc_result = self._try_cloc()
         if cloc_result:
-            return cloc_result
+            yield cloc_result
+            return
         
-        # Fallback to manual counting
-        return self._manual_count()
+        yield from self._manual_count_iter()
     
     def _try_cloc(self) -> Optional[Dict[str, Any]]:
         """Try to use cloc tool if available"""
@@ -115,6 +334,9 @@ class MetricsCollector:
             
             if result.returncode == 0 and result.stdout:
                 cloc_data = json.loads(result.stdout)
+                if not isinstance(cloc_data, dict):
+                    logger.debug("cloc returned unexpected JSON payload, falling back to manual count")
+                    return None
                 
                 # Extract summary
                 summary = cloc_data.get('SUM', {})
@@ -142,30 +364,49 @@ class MetricsCollector:
                 }
         except FileNotFoundError:
             # cloc not installed
-            pass
+            logger.debug("cloc not installed, falling back to manual count")
         except subprocess.TimeoutExpired:
             # cloc took too long
-            pass
-        except (json.JSONDecodeError, ValueError, Exception):
-            # Failed to parse or other error
-            pass
+            logger.debug("cloc timed out, falling back to manual count")
+        except (json.JSONDecodeError, ValueError, OSError, subprocess.SubprocessError) as e:
+            # Failed to parse or run cloc
+            logger.debug("cloc failed (%s), falling back to manual count", e)
         
         return None
     
     def _manual_count(self) -> Dict[str, Any]:
         """Manually count lines of code and files"""
+        result = None
+        for result in self._manual_count_iter():
+            pass
+        return result
+    
+    def _manual_count_iter(self) -> Iterator[Dict[str, Any]]:
+        """Manually count lines of code, yielding a snapshot every PROGRESS_BATCH_SIZE files.
+        
+        Files are counted batch by batch, so only per-language totals are kept in memory.
+        """
         languages = {}
-        total_lines = 0
-        total_files = 0
-        total_blank = 0
-        total_comment = 0
+        totals = {"files": 0, "lines": 0, "blank": 0, "comment": 0, "sampled": 0}
+        executor = None
         
-        for file_path in self._walk_code_files():
-            try:
-                lang = self._detect_language(file_path)
-                if not lang:
-                    continue
-                
+        def snapshot() -> Dict[str, Any]:
+            return {
+                "lines_of_code": totals["lines"],
+                "files": totals["files"],
+                "languages": {lang: dict(stats) for lang, stats in languages.items()},
+                "blank_lines": totals["blank"],
+                "comment_lines": totals["comment"],
+                "sampled_files": totals["sampled"],
+                "method": "manual"
+            }
+        
+        def count_batch(paths: List[str], langs: List[str]) -> None:
+            nonlocal executor
+            if executor is None and len(paths) >= self.PARALLEL_MIN_FILES:
+                executor = self._create_executor()
+            
+            for lang, code, blank, comment, sampled in self._count_all(paths, langs, executor):
                 if lang not in languages:
                     languages[lang] = {
                         "files": 0,
@@ -174,201 +415,97 @@ class MetricsCollector:
                         "comment": 0,
                     }
                 
-                file_stats = self._count_file_lines(file_path, lang)
-                
                 languages[lang]["files"] += 1
-                languages[lang]["lines"] += file_stats["code"]
-                languages[lang]["blank"] += file_stats["blank"]
-                languages[lang]["comment"] += file_stats["comment"]
+                languages[lang]["lines"] += code
+                languages[lang]["blank"] += blank
+                languages[lang]["comment"] += comment
                 
-                total_files += 1
-                total_lines += file_stats["code"]
-                total_blank += file_stats["blank"]
-                total_comment += file_stats["comment"]
-                
-            except Exception:
-                # Skip files that can't be read
-                continue
-        
-        return {
-            "lines_of_code": total_lines,
-            "files": total_files,
-            "languages": languages,
-            "blank_lines": total_blank,
-            "comment_lines": total_comment,
-            "method": "manual"
-        }
-    
-    def _walk_code_files(self):
-        """Walk through repository and yield code files"""
-        # Normalize repo path for comparison
-        repo_path_normalized = self.repo_path.resolve()
+                totals["files"] += 1
+                totals["lines"] += code
+                totals["blank"] += blank
+                totals["comment"] += comment
+                if sampled:
+                    totals["sampled"] += 1
         
-        for root, dirs, files in os.walk(self.repo_path):
-            root_path = Path(root).resolve()
-            
-            # Skip if current directory is in ignored path
-            if self._is_ignored_path(root_path, repo_path_normalized):
-                dirs[:] = []  # Don't descend into ignored directories
-                continue
-            
-            # Filter out ignored directories from dirs list
-            dirs[:] = [
-                d for d in dirs 
-                if d not in self.IGNORE_DIRS 
-                and not d.startswith('.')
-                and not self._is_ignored_path(root_path / d, repo_path_normalized)
-            ]
-            
-            for file in files:
-                file_path = root_path / file
-                
-                # Skip if in ignored directory
-                if self._is_ignored_path(file_path, repo_path_normalized):
-                    continue
-                
-                # Skip non-code files by extension
-                if file_path.suffix.lower() in self.EXCLUDE_EXTENSIONS:
-                    continue
-                
-                # Skip non-code files by name (case-insensitive)
-                if file_path.name.lower() in self.EXCLUDE_FILENAMES:
+        try:
+            paths = []
+            langs = []
+            for file_path in self._walk_code_files():
+                lang = self._detect_language(file_path)
+                if not lang:
                     continue
                 
-                # Check if it's a code file
-                if file_path.suffix.lower() in self.CODE_EXTENSIONS:
-                    yield file_path
-    
-    def _is_ignored_path(self, path: Path, repo_root: Path) -> bool:
-        """Check if a path should be ignored (is in an ignored directory)"""
-        try:
-            # Get relative path from repo root
-            relative_path = path.relative_to(repo_root)
-            
-            # Check all directory parts of the path
-            # For files, exclude the filename (last part)
-            # For directories, check all parts
-            parts = relative_path.parts
-            
-            # If it's a file (has a suffix), only check parent directories
-            if path.suffix:
-                parts = parts[:-1]
-            
-            # Check each directory in the path
-            for part in parts:
-                # Check if part matches any ignored directory
-                if part in self.IGNORE_DIRS:
-                    return True
-                # Also ignore directories starting with dot (like .git, .venv, etc.)
-                if part.startswith('.'):
-                    return True
+                paths.append(str(file_path))
+                langs.append(lang)
+                if len(paths) >= self.PROGRESS_BATCH_SIZE:
+                    count_batch(paths, langs)
+                    paths = []
+                    langs = []
+                    yield snapshot()
             
-            return False
-        except (ValueError, OSError):
-            # Path is not relative to repo root or can't be checked
-            return True
-    
-    def _detect_language(self, file_path: Path) -> Optional[str]:
-        """Detect programming language from file extension"""
-        ext = file_path.suffix.lower()
+            if paths:
+                count_batch(paths, langs)
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
-        lang_map = {
-            '.js': 'JavaScript',
-            '.jsx': 'JavaScript',
-            '.mjs': 'JavaScript',
-            '.cjs': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.tsx': 'TypeScript',
-            '.py': 'Python',
-            '.pyw': 'Python',
-            '.java': 'Java',
-            '.c': 'C',
-            '.cpp': 'C++',
-            '.cc': 'C++',
-            '.cxx': 'C++',
-            '.h': 'C/C++ Header',
-            '.hpp': 'C++ Header',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.rb': 'Ruby',
-            '.php': 'PHP',
-            '.swift': 'Swift',
-            '.kt': 'Kotlin',
-            '.kts': 'Kotlin',
-            '.scala': 'Scala',
-            '.sh': 'Shell',
-            '.bash': 'Shell',
-            '.zsh': 'Shell',
-            '.css': 'CSS',
-            '.scss': 'SCSS',
-            '.sass': 'Sass',
-            '.less': 'Less',
-            '.sql': 'SQL',
-            '.xml': 'XML',
-            '.toml': 'TOML',
-            '.ini': 'INI',
-            '.cfg': 'Config',
-            '.conf': 'Config',
-        }
-        
-        return lang_map.get(ext)
+        yield snapshot()
     
-    def _count_file_lines(self, file_path: Path, lang: str) -> Dict[str, int]:
-        """Count lines in a file"""
-        code_lines = 0
-        blank_lines = 0
-        comment_lines = 0
-        
+    def _create_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Create the process pool used for counting, or None if unavailable"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    stripped = line.strip()
-                    
-                    if not stripped:
-                        blank_lines += 1
-                    elif self._is_comment(stripped, lang):
-                        comment_lines += 1
-                    else:
-                        code_lines += 1
-        except Exception:
-            # If file can't be read, return zeros
-            pass
-        
-        return {
-            "code": code_lines,
-            "blank": blank_lines,
-            "comment": comment_lines,
-        }
+            return ProcessPoolExecutor(max_workers=os.cpu_count())
+        except (OSError, NotImplementedError):
+            # Process pools unavailable (restricted sandbox, missing sem_open, ...)
+            return None
     
-    def _is_comment(self, line: str, lang: str) -> bool:
-        """Check if a line is a comment"""
-        # Single line comments
-        comment_patterns = {
-            'JavaScript': ['//', '/*', '*/', '*'],
-            'TypeScript': ['//', '/*', '*/', '*'],
-            'Python': ['#'],
-            'Java': ['//', '/*', '*/', '*'],
-            'C': ['//', '/*', '*/', '*'],
-            'C++': ['//', '/*', '*/', '*'],
-            'Go': ['//', '/*', '*/'],
-            'Rust': ['//', '/*', '*/'],
-            'Ruby': ['#'],
-            'PHP': ['//', '#', '/*', '*/'],
-            'Swift': ['//', '/*', '*/'],
-            'Kotlin': ['//', '/*', '*/'],
-            'Scala': ['//', '/*', '*/'],
-            'Shell': ['#'],
-            'HTML': ['<!--', '-->'],
-            'CSS': ['/*', '*/'],
-            'SCSS': ['//', '/*', '*/'],
-            'Sass': ['//', '/*', '*/'],
-            'SQL': ['--', '/*', '*/'],
-        }
+    def _count_all(self, paths: List[str], langs: List[str],
+                   executor: Optional[ProcessPoolExecutor] = None):
+        """Count lines for a batch of files, spreading the work across CPU cores"""
+        if executor is None:
+            return list(map(_count_file_lines_worker, paths, langs))
         
-        patterns = comment_patterns.get(lang, [])
-        for pattern in patterns:
-            if line.startswith(pattern):
-                return True
+        try:
+            return list(executor.map(_count_file_lines_worker, paths, langs, chunksize=64))
+        except (OSError, RuntimeError):
+            # Pool broke down mid-run; count this batch in-process
+            return list(map(_count_file_lines_worker, paths, langs))
+    
+    def _walk_code_files(self):
+        """Walk through repository and yield code files"""
+        code_ext_re = self._CODE_EXT_RE
+        ignore_dirs = self.IGNORE_DIRS
+        exclude_names = self.EXCLUDE_FILENAMES
         
-        return False
-
+        stack = [str(self.repo_path)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                # Don't descend into ignored or hidden directories
+                                if name not in ignore_dirs and not name.startswith('.'):
+                                    stack.append(entry.path)
+                                continue
+                        except OSError:
+                            continue
+                        
+                        # Code files only; the pattern also rules out EXCLUDE_EXTENSIONS
+                        if not code_ext_re.match(name):
+                            continue
+                        
+                        # Skip non-code files by name (case-insensitive)
+                        if name.lower() in exclude_names:
+                            continue
+                        
+                        yield Path(entry.path)
+            except OSError:
+                # Directory vanished or is unreadable
+                continue
+    
+    def _detect_language(self, file_path: Path) -> Optional[str]:
+        """Detect programming language from file extension"""
+        return self.LANGUAGE_MAP.get(file_path.suffix.lower())
@@ -0,0 +1,64 @@
+"""Subprocess helpers shared by the analyzers"""
+
+import mmap
+import os
+import signal
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+def kill_process_tree(proc: subprocess.Popen) -> None:
+    """Kill a process together with the children it spawned"""
+    try:
+        if os.name == 'posix':
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+@contextmanager
+def run_spooled(cmd: List[str], timeout: float, cwd: str,
+                env: Optional[Dict[str, str]] = None,
+                stderr: int = subprocess.PIPE,
+                on_start: Optional[Callable[[subprocess.Popen], None]] = None
+                ) -> Iterator[subprocess.CompletedProcess]:
+    """Run a command with stdout spooled to a temp file, killing its process tree on any error.
+    
+    Yields a CompletedProcess whose stdout is a read-only buffer (mmap) over the
+    captured output, valid only inside the with block, and whose stderr is bytes
+    when captured with PIPE (None otherwise). on_start is called with the Popen
+    right after it starts, e.g. to register it for cancellation.
+    """
+    with tempfile.TemporaryFile() as out:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=out,
+            stderr=stderr,
+            cwd=cwd,
+            env=env,
+            # Own process group, so workers spawned by the command die with it
+            start_new_session=(os.name == 'posix')
+        )
+        try:
+            if on_start is not None:
+                on_start(proc)
+            _, err = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_tree(proc)
+            proc.communicate()
+            raise
+        except BaseException:
+            kill_process_tree(proc)
+            proc.wait()
+            raise
+        
+        # Large reports stay on disk and are decoded straight from the mapping
+        if out.seek(0, os.SEEK_END) == 0:
+            yield subprocess.CompletedProcess(cmd, proc.returncode, b'', err)
+            return
+        with mmap.mmap(out.fileno(), 0, access=mmap.ACCESS_READ) as stdout:
+            yield subprocess.CompletedProcess(cmd, proc.returncode, stdout, err)
@@ -1,22 +1,215 @@
 """Quality analysis module for test execution and coverage"""
 
+import hashlib
 import json
 import subprocess
 import os
+import re
+import shutil
+import tempfile
+import threading
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Tuple
 from datetime import datetime, timezone
 
+from . import json_utils
+from .cache_manager import CacheManager
+from .metrics_collector import MetricsCollector
+from .process_utils import kill_process_tree, run_spooled
+from .repo_facts import RepoFactsCollector
+
+
+# Summary footer of a pytest run, e.g. "==== 1 failed, 3 passed, 2 skipped in 0.12s ===="
+_PYTEST_SUMMARY = re.compile(rb'^=+ ((?:\d+ [a-z]+)(?:, \d+ [a-z]+)*) in ([\d.]+)s', re.MULTILINE)
+_PYTEST_COUNT = re.compile(rb'(\d+) (\w+)')
+# unittest footer: "Ran 4 tests in 0.003s" followed by "OK" or "FAILED (failures=1, errors=2)"
+_UNITTEST_RAN = re.compile(rb'^Ran (\d+) tests? in ([\d.]+)s', re.MULTILINE)
+_UNITTEST_STATUS = re.compile(rb'^(OK|FAILED)(?: \(([^)]*)\))?', re.MULTILINE)
+
+
+class RunnerSpec(NamedTuple):
+    """A test runner method; framework None means the runner reports it"""
+    framework: Optional[str]
+    method: str
+
+
+class JSFramework(NamedTuple):
+    """A JS test framework run through 'npm test' with a JSON reporter"""
+    name: str
+    dep_key: str
+    args: Tuple[str, ...]
+    parser: str
+    # Also applies to any package with a "test" script, without the dependency
+    default_runner: bool = False
+
+
+@lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """Cached lookup of a tool on PATH (avoids spawning probes for missing binaries)"""
+    return shutil.which(name)
+
+
+@lru_cache(maxsize=None)
+def _pytest_plugins() -> str:
+    """Lower-cased 'pytest -VV' output, which lists the installed plugins"""
+    try:
+        result = subprocess.run(
+            ['pytest', '--version', '--version'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    if result.returncode != 0:
+        return ""
+    return (result.stdout + result.stderr).lower()
+
 
 class QualityAnalyzer:
     """Analyzes test results and code coverage"""
     
-    def __init__(self, repo_path: str):
+    # Top-level Jest --json fields needed for the summary
+    JEST_SUMMARY_FIELDS = (
+        "numTotalTests", "numPassedTests", "numFailedTests", "numPendingTests", "startTime",
+    )
+    
+    # Test runners per primary language, tried in order until one returns results.
+    # Runners with a framework return the results; the others return (framework, results).
+    LANG_RUNNERS = {
+        "javascript": (RunnerSpec(None, "_run_js_probes"),),
+        "python": (RunnerSpec("pytest", "_run_pytest"), RunnerSpec("unittest", "_run_unittest")),
+    }
+    LANG_ALIASES = {"node": "javascript", "node.js": "javascript", "nodejs": "javascript"}
+    
+    # JS frameworks in precedence order: the first one with results wins
+    JS_FRAMEWORKS = (
+        JSFramework("jest", "jest", ("--", "--json", "--no-coverage"), "_parse_jest_json",
+                    default_runner=True),
+        JSFramework("mocha", "mocha", ("--", "--reporter", "json"), "_parse_mocha_json"),
+        JSFramework("vitest", "vitest", ("--", "--reporter=json"), "_parse_vitest_json"),
+    )
+    
+    # Wall-clock budget (seconds) shared by every test run of one analysis
+    TEST_TIME_BUDGET = 600
+    
+    # Files that change test or coverage results on the same commit; their contents
+    # are part of the cache key
+    TEST_INPUT_FILES = (
+        # Manifests and lockfiles
+        "package.json", "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml",
+        "requirements.txt", "requirements-dev.txt", "pyproject.toml", "setup.py", "setup.cfg",
+        "Pipfile", "Pipfile.lock", "poetry.lock",
+        # Test runner configuration
+        "pytest.ini", "tox.ini", ".coveragerc",
+        "jest.config.js", "jest.config.ts", "jest.config.mjs", "jest.config.cjs", "jest.config.json",
+        "vitest.config.js", "vitest.config.ts", "vitest.config.mjs",
+        ".mocharc.json", ".mocharc.js", ".mocharc.yml", ".mocharc.yaml",
+        # Pre-generated coverage reports
+        "coverage.xml", "coverage-summary.json", "coverage/coverage-summary.json",
+        ".nyc_output/coverage.json", ".coverage",
+        # Rewritten by npm install, so installing dependencies invalidates the entry
+        "node_modules/.package-lock.json",
+    )
+    
+    # Coverage report parser to use after a framework produced results
+    COVERAGE_PARSERS = {
+        "jest": "_parse_jest_coverage",
+        "vitest": "_parse_vitest_coverage",
+        "pytest": "_parse_pytest_coverage",
+    }
+    
+    def __init__(self, repo_path: str, use_cache: bool = True):
         self.repo_path = Path(repo_path)
+        self.use_cache = use_cache
+        self.cache_manager = None
+        if use_cache:
+            try:
+                self.cache_manager = CacheManager()
+            except OSError:
+                # Cache directory not writable, continue without cache
+                self.cache_manager = None
+        # Running probe processes by framework name, so losing probes can be killed
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._cancelled: set = set()
+        self._procs_lock = threading.Lock()
+        self._package_json: Optional[Dict[str, Any]] = None
+        self._package_json_loaded = False
+        # time.monotonic() deadline for the current analysis (None outside analyze)
+        self._deadline: Optional[float] = None
+        # Whether per-file test results are kept for the current analysis
+        self._include_test_files = False
     
-    def analyze(self, stack_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Run tests and collect coverage"""
+    def analyze(self, stack_info: Dict[str, Any], force: bool = False,
+                include_test_files: bool = False) -> Dict[str, Any]:
+        """Run tests and collect coverage
+        
+        Results are cached per commit, file signature and the contents of the
+        manifests, lockfiles, test configs and coverage reports (TEST_INPUT_FILES), so
+        re-analyzing an unchanged checkout skips the test run. Only runs where a test
+        framework produced results are cached. force=True ignores a cached result.
+        include_test_files=True keeps the per-file breakdown ("test_files") where the
+        framework reports one; by default only the summary counters are read.
+        """
+        cache_key = None
+        if self.cache_manager:
+            cache_key = self.cache_manager.get_cache_key("quality", {
+                "repo_path": str(self.repo_path.resolve()),
+                "commit_sha": RepoFactsCollector(str(self.repo_path)).collect()["commit_sha"],
+                "signature": MetricsCollector(str(self.repo_path), use_cache=False).signature(),
+                "primary_language": stack_info.get("primary_language", ""),
+                "include_test_files": include_test_files,
+                "test_inputs": self._test_inputs_digest(),
+            })
+            if not force:
+                cached = self.cache_manager.get(cache_key)
+                if cached:
+                    try:
+                        result = json_utils.loads(cached)
+                    except ValueError:
+                        pass
+                    else:
+                        result["timestamp"] = datetime.now(timezone.utc).isoformat()
+                        return result
+        
+        self._deadline = time.monotonic() + self.TEST_TIME_BUDGET
+        self._include_test_files = include_test_files
+        try:
+            result = self._analyze(stack_info)
+        finally:
+            self._deadline = None
+            self._include_test_files = False
+        
+        # Only cache real runs: the "no tests" placeholder (e.g. before dependencies are
+        # installed, or after the time budget ran out) must not stick for the cache TTL
+        if cache_key and result["test_framework"]:
+            self.cache_manager.set(cache_key, json.dumps(result))
+        return result
+    
+    def _test_inputs_digest(self) -> str:
+        """Digest of the TEST_INPUT_FILES present (path and content of each)"""
+        digest = hashlib.blake2b(digest_size=16)
+        for rel_path in self.TEST_INPUT_FILES:
+            file_digest = hashlib.blake2b(digest_size=16)
+            try:
+                with open(self.repo_path / rel_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        file_digest.update(chunk)
+            except OSError:
+                continue
+            digest.update(f"{rel_path}\0{file_digest.hexdigest()}\n".encode())
+        return digest.hexdigest()
+    
+    def _analyze(self, stack_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Run tests and collect coverage (uncached)"""
+        # Test runs may write reports: rescan the report locations for this run
+        self.__dict__.pop("_coverage_files", None)
+        
         result = {
             "test_results": None,
             "coverage": None,
@@ -25,50 +218,31 @@ class QualityAnalyzer:
         }
         
         primary_lang = stack_info.get("primary_language", "").lower()
-        frameworks = [f.lower() for f in stack_info.get("frameworks", [])]
+        primary_lang = self.LANG_ALIASES.get(primary_lang, primary_lang)
+        
+        # Coverage formats already parsed in this run
+        tried_coverage = set()
         
         # Detect and run tests based on stack
-        if primary_lang == "javascript" or "node" in primary_lang:
-            # Try Jest first (most common for React/Node)
-            jest_result = self._run_jest()
-            if jest_result:
-                result["test_results"] = jest_result
-                result["test_framework"] = "jest"
-                result["coverage"] = self._parse_jest_coverage()
-            
-            # Try Mocha if Jest didn't work
-            if not result["test_results"]:
-                mocha_result = self._run_mocha()
-                if mocha_result:
-                    result["test_results"] = mocha_result
-                    result["test_framework"] = "mocha"
+        for spec in self.LANG_RUNNERS.get(primary_lang, ()):
+            outcome = getattr(self, spec.method)()
+            if spec.framework is None:
+                framework, test_results = outcome
+            else:
+                framework, test_results = spec.framework, outcome
             
-            # Try Vitest
-            if not result["test_results"]:
-                vitest_result = self._run_vitest()
-                if vitest_result:
-                    result["test_results"] = vitest_result
-                    result["test_framework"] = "vitest"
-                    result["coverage"] = self._parse_vitest_coverage()
-        
-        elif primary_lang == "python":
-            # Try pytest first (most common)
-            pytest_result = self._run_pytest()
-            if pytest_result:
-                result["test_results"] = pytest_result
-                result["test_framework"] = "pytest"
-                result["coverage"] = self._parse_pytest_coverage()
-            
-            # Try unittest if pytest didn't work
-            if not result["test_results"]:
-                unittest_result = self._run_unittest()
-                if unittest_result:
-                    result["test_results"] = unittest_result
-                    result["test_framework"] = "unittest"
+            if test_results:
+                result["test_results"] = test_results
+                result["test_framework"] = framework
+                coverage_parser = self.COVERAGE_PARSERS.get(framework)
+                if coverage_parser:
+                    result["coverage"] = getattr(self, coverage_parser)()
+                    tried_coverage.add(framework)
+                break
         
         # Try to find existing coverage reports
         if not result["coverage"]:
-            result["coverage"] = self._find_existing_coverage()
+            result["coverage"] = self._find_existing_coverage(skip=tried_coverage)
         
         # If no tests were run, return empty structure
         if not result["test_results"]:
@@ -83,212 +257,224 @@ class QualityAnalyzer:
         
         return result
     
-    def _run_jest(self) -> Optional[Dict[str, Any]]:
-        """Run Jest tests"""
-        package_json = self.repo_path / "package.json"
-        if not package_json.exists():
-            return None
+    def _run_js_probes(self) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Run the JS test framework probes concurrently.
         
-        try:
-            with open(package_json, 'r') as f:
-                pkg_data = json.load(f)
-                scripts = pkg_data.get("scripts", {})
-                deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
-                
-                # Check if Jest is available
-                if "jest" not in deps and "test" not in scripts:
-                    return None
-        except Exception:
-            return None
+        Precedence follows JS_FRAMEWORKS: the first probe in that order with a result
+        wins and the remaining probes are killed.
+        """
+        pkg_data = self._load_package_json()
+        if pkg_data is None:
+            return None, None
+        deps = set()
+        for key in ("dependencies", "devDependencies"):
+            section = pkg_data.get(key)
+            if isinstance(section, dict):
+                deps.update(section)
         
-        try:
-            # Try to run Jest
-            result = subprocess.run(
-                ['npm', 'test', '--', '--json', '--no-coverage'],
-                capture_output=True,
-                text=True,
-                timeout=600,
-                cwd=str(self.repo_path)
-            )
-            
-            if result.returncode == 0 or result.returncode == 1:  # Jest returns 1 if tests fail
+        # Decide up front which frameworks apply
+        scripts = pkg_data.get("scripts")
+        has_test_script = isinstance(scripts, dict) and "test" in scripts
+        specs = [
+            spec for spec in self.JS_FRAMEWORKS
+            if spec.dep_key in deps or (spec.default_runner and has_test_script)
+        ]
+        if not specs or not _which('npm'):
+            return None, None
+        
+        with self._procs_lock:
+            self._cancelled.clear()
+        
+        with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+            futures = [(spec.name, executor.submit(self._run_js, spec)) for spec in specs]
+            for index, (name, future) in enumerate(futures):
                 try:
-                    jest_data = json.loads(result.stdout)
-                    return {
-                        "total": jest_data.get("numTotalTests", 0),
-                        "passed": jest_data.get("numPassedTests", 0),
-                        "failed": jest_data.get("numFailedTests", 0),
-                        "skipped": jest_data.get("numPendingTests", 0),
-                        "duration": jest_data.get("startTime", 0),
-                        "test_files": jest_data.get("testResults", []),
-                    }
-                except json.JSONDecodeError:
-                    # Try parsing from stderr or different format
-                    pass
-        except (FileNotFoundError, subprocess.TimeoutExpired, Exception):
-            pass
+                    test_results = future.result()
+                except Exception:
+                    test_results = None
+                if test_results:
+                    for other_name, other_future in futures[index + 1:]:
+                        other_future.cancel()
+                        self._kill_probe(other_name)
+                    return name, test_results
         
-        return None
+        return None, None
     
-    def _run_mocha(self) -> Optional[Dict[str, Any]]:
-        """Run Mocha tests"""
-        package_json = self.repo_path / "package.json"
-        if not package_json.exists():
-            return None
+    def _load_package_json(self) -> Optional[Dict[str, Any]]:
+        """Parse package.json once per analyzer (None if missing or invalid)"""
+        if not self._package_json_loaded:
+            self._package_json_loaded = True
+            try:
+                pkg_data = json_utils.load_file(self.repo_path / "package.json")
+                self._package_json = pkg_data if isinstance(pkg_data, dict) else None
+            except (OSError, ValueError):
+                self._package_json = None
+        return self._package_json
+    
+    @contextmanager
+    def _run_probe_command(self, name: str, cmd: List[str], timeout: int,
+                           merge_stderr: bool = False) -> Iterator[Optional[Tuple[int, Any]]]:
+        """Run a probe command with its stdout spooled to a temp file.
         
-        try:
-            with open(package_json, 'r') as f:
-                pkg_data = json.load(f)
-                deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
-                
-                if "mocha" not in deps:
-                    return None
-        except Exception:
-            return None
+        Yields (returncode, output) where output is a read-only buffer (mmap) over the
+        captured stdout, or None if the probe was cancelled. The process is tracked by
+        name so it can be killed. Output is only valid inside the with block.
         
-        try:
-            result = subprocess.run(
-                ['npm', 'test', '--', '--reporter', 'json'],
-                capture_output=True,
-                text=True,
-                timeout=600,
-                cwd=str(self.repo_path)
-            )
-            
-            if result.returncode == 0 or result.returncode == 1:
-                try:
-                    mocha_data = json.loads(result.stdout)
-                    total = len(mocha_data.get("tests", []))
-                    passed = sum(1 for t in mocha_data.get("tests", []) if t.get("err") is None)
-                    failed = total - passed
-                    
-                    return {
-                        "total": total,
-                        "passed": passed,
-                        "failed": failed,
-                        "skipped": 0,
-                        "duration": mocha_data.get("duration", 0),
-                    }
-                except json.JSONDecodeError:
-                    pass
-        except (FileNotFoundError, subprocess.TimeoutExpired, Exception):
-            pass
+        The timeout is capped by what is left of the analysis budget; once the budget
+        is spent, TimeoutExpired is raised without starting the command.
+        """
+        if self._deadline is not None:
+            timeout = min(timeout, self._deadline - time.monotonic())
+            if timeout <= 0:
+                raise subprocess.TimeoutExpired(cmd, 0)
         
-        return None
-    
-    def _run_vitest(self) -> Optional[Dict[str, Any]]:
-        """Run Vitest tests"""
-        package_json = self.repo_path / "package.json"
-        if not package_json.exists():
-            return None
+        with self._procs_lock:
+            cancelled = name in self._cancelled
+        if cancelled:
+            yield None
+            return
         
-        try:
-            with open(package_json, 'r') as f:
-                pkg_data = json.load(f)
-                deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
-                
-                if "vitest" not in deps:
-                    return None
-        except Exception:
-            return None
+        def register(proc: subprocess.Popen) -> None:
+            # A probe cancelled while its process was starting is killed right away
+            with self._procs_lock:
+                self._procs[name] = proc
+                cancelled = name in self._cancelled
+            if cancelled:
+                kill_process_tree(proc)
         
         try:
-            result = subprocess.run(
-                ['npm', 'test', '--', '--reporter=json'],
-                capture_output=True,
-                text=True,
-                timeout=600,
-                cwd=str(self.repo_path)
-            )
-            
-            if result.returncode == 0 or result.returncode == 1:
-                try:
-                    vitest_data = json.loads(result.stdout)
-                    return {
-                        "total": vitest_data.get("numTotalTests", 0),
-                        "passed": vitest_data.get("numPassedTests", 0),
-                        "failed": vitest_data.get("numFailedTests", 0),
-                        "skipped": vitest_data.get("numPendingTests", 0),
-                        "duration": vitest_data.get("duration", 0),
-                    }
-                except json.JSONDecodeError:
-                    pass
-        except (FileNotFoundError, subprocess.TimeoutExpired, Exception):
+            with run_spooled(
+                cmd,
+                timeout=timeout,
+                cwd=str(self.repo_path),
+                stderr=subprocess.STDOUT if merge_stderr else subprocess.DEVNULL,
+                on_start=register
+            ) as result:
+                with self._procs_lock:
+                    cancelled = name in self._cancelled
+                yield None if cancelled else (result.returncode, result.stdout)
+        finally:
+            with self._procs_lock:
+                self._procs.pop(name, None)
+    
+    def _kill_probe(self, name: str) -> None:
+        """Kill a running probe and prevent it from starting"""
+        with self._procs_lock:
+            self._cancelled.add(name)
+            proc = self._procs.get(name)
+        if proc is not None and proc.poll() is None:
+            kill_process_tree(proc)
+    
+    def _run_js(self, spec: JSFramework) -> Optional[Dict[str, Any]]:
+        """Run a JS framework through npm test and parse its JSON report"""
+        try:
+            with self._run_probe_command(spec.name, ['npm', 'test', *spec.args], timeout=600) as result:
+                if result is None:
+                    return None
+                returncode, stdout = result
+                
+                if returncode == 0 or returncode == 1:  # Runners return 1 if tests fail
+                    try:
+                        return getattr(self, spec.parser)(stdout)
+                    except json.JSONDecodeError:
+                        pass
+        except (subprocess.TimeoutExpired, Exception):
             pass
         
         return None
     
+    def _parse_jest_json(self, output: Any) -> Dict[str, Any]:
+        """Parse a Jest --json report
+        
+        Unless the analysis asked for test files only the summary counters are read,
+        streaming the report so the (potentially huge) testResults array is never built.
+        """
+        if self._include_test_files:
+            jest_data = json_utils.loads(output)
+        else:
+            jest_data = json_utils.load_fields(output, self.JEST_SUMMARY_FIELDS)
+        test_results = {
+            "total": jest_data.get("numTotalTests", 0),
+            "passed": jest_data.get("numPassedTests", 0),
+            "failed": jest_data.get("numFailedTests", 0),
+            "skipped": jest_data.get("numPendingTests", 0),
+            "duration": jest_data.get("startTime", 0),
+        }
+        if self._include_test_files:
+            test_results["test_files"] = jest_data.get("testResults", [])
+        return test_results
+    
+    @staticmethod
+    def _parse_mocha_json(output: Any) -> Dict[str, Any]:
+        """Parse a Mocha JSON reporter report"""
+        mocha_data = json_utils.loads(output)
+        total = len(mocha_data.get("tests", []))
+        passed = sum(1 for t in mocha_data.get("tests", []) if t.get("err") is None)
+        failed = total - passed
+        
+        return {
+            "total": total,
+            "passed": passed,
+            "failed": failed,
+            "skipped": 0,
+            "duration": mocha_data.get("duration", 0),
+        }
+    
+    @staticmethod
+    def _parse_vitest_json(output: Any) -> Dict[str, Any]:
+        """Parse a Vitest JSON reporter report"""
+        vitest_data = json_utils.loads(output)
+        return {
+            "total": vitest_data.get("numTotalTests", 0),
+            "passed": vitest_data.get("numPassedTests", 0),
+            "failed": vitest_data.get("numFailedTests", 0),
+            "skipped": vitest_data.get("numPendingTests", 0),
+            "duration": vitest_data.get("duration", 0),
+        }
+    
     def _run_pytest(self) -> Optional[Dict[str, Any]]:
         """Run pytest tests"""
-        try:
-            # Check if pytest is available
-            result = subprocess.run(
-                ['pytest', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                cwd=str(self.repo_path)
-            )
-            
-            if result.returncode != 0:
-                return None
-        except FileNotFoundError:
+        if not _which('pytest'):
             return None
         
+        plugins = _pytest_plugins()
+        cmd = ['pytest', '-q', '--tb=no', '-p', 'no:cacheprovider']
+        if 'xdist' in plugins:
+            # Shard across cores with pytest-xdist; keep two cores free for the rest of the system.
+            # pytest-json-report merges the worker results into the single report file.
+            workers = max(1, (os.cpu_count() or 1) - 2)
+            cmd += ['-n', str(workers), '--dist=loadfile']
+        
         try:
-            # Run pytest with JSON report
-            result = subprocess.run(
-                ['pytest', '--json-report', '--json-report-file=pytest-report.json', '-v'],
-                capture_output=True,
-                text=True,
-                timeout=600,
-                cwd=str(self.repo_path)
-            )
-            
-            # Try to read the JSON report
-            report_file = self.repo_path / "pytest-report.json"
-            if report_file.exists():
-                try:
-                    with open(report_file, 'r') as f:
-                        pytest_data = json.load(f)
-                        return {
-                            "total": pytest_data.get("summary", {}).get("total", 0),
-                            "passed": pytest_data.get("summary", {}).get("passed", 0),
-                            "failed": pytest_data.get("summary", {}).get("failed", 0),
-                            "skipped": pytest_data.get("summary", {}).get("skipped", 0),
-                            "duration": pytest_data.get("duration", 0),
-                        }
-                except Exception:
-                    pass
-            
-            # Fallback: parse from stdout
-            if result.returncode == 0 or result.returncode == 1:
-                # Parse pytest output
-                lines = result.stdout.split('\n')
-                total = 0
-                passed = 0
-                failed = 0
+            # Per-run report location, so a pytest-report.json in the repo is never clobbered
+            with tempfile.TemporaryDirectory() as report_dir:
+                report_file = Path(report_dir) / "pytest-report.json"
+                if 'json-report' in plugins:
+                    cmd += ['--json-report', f'--json-report-file={report_file}']
                 
-                for line in lines:
-                    if 'passed' in line.lower() and 'failed' in line.lower():
-                        # Format: "X passed, Y failed in Zs"
-                        parts = line.split()
-                        for i, part in enumerate(parts):
-                            if part == 'passed':
-                                passed = int(parts[i-1]) if i > 0 else 0
-                            elif part == 'failed':
-                                failed = int(parts[i-1]) if i > 0 else 0
-                        total = passed + failed
-                        break
-                
-                if total > 0:
-                    return {
-                        "total": total,
-                        "passed": passed,
-                        "failed": failed,
-                        "skipped": 0,
-                        "duration": 0,
-                    }
+                with self._run_probe_command("pytest", cmd, timeout=600) as result:
+                    if result is None:
+                        return None
+                    returncode, output = result
+                    
+                    # The JSON report is authoritative; stdout is only parsed without it
+                    if report_file.exists():
+                        try:
+                            pytest_data = json_utils.load_file(report_file)
+                            summary = pytest_data.get("summary", {})
+                            return {
+                                "total": summary.get("total", 0),
+                                "passed": summary.get("passed", 0),
+                                "failed": summary.get("failed", 0),
+                                "skipped": summary.get("skipped", 0),
+                                "duration": pytest_data.get("duration", 0),
+                            }
+                        except Exception:
+                            pass
+                    
+                    # Fallback: parse from stdout
+                    if returncode == 0 or returncode == 1:
+                        return self._parse_pytest_output(output)
         except (subprocess.TimeoutExpired, Exception):
             pass
         
@@ -296,66 +482,120 @@ class QualityAnalyzer:
     
     def _run_unittest(self) -> Optional[Dict[str, Any]]:
         """Run Python unittest"""
+        if not _which('python'):
+            return None
+        
         try:
-            result = subprocess.run(
-                ['python', '-m', 'unittest', 'discover', '-v'],
-                capture_output=True,
-                text=True,
-                timeout=600,
-                cwd=str(self.repo_path)
-            )
-            
-            if result.returncode == 0 or result.returncode == 1:
-                # Parse unittest output
-                lines = result.stdout.split('\n')
-                total = 0
-                passed = 0
-                failed = 0
-                
-                for line in lines:
-                    if 'Ran' in line and 'test' in line:
-                        # Format: "Ran X tests in Ys"
-                        parts = line.split()
-                        for i, part in enumerate(parts):
-                            if part == 'tests' and i > 0:
-                                total = int(parts[i-1]) if parts[i-1].isdigit() else 0
-                    if 'OK' in line:
-                        passed = total
-                    if 'FAILED' in line:
-                        failed = total - passed
+            # unittest reports its summary on stderr, so capture both streams
+            with self._run_probe_command(
+                "unittest", ['python', '-m', 'unittest', 'discover'], timeout=600, merge_stderr=True
+            ) as result:
+                if result is None:
+                    return None
+                returncode, output = result
                 
-                if total > 0:
-                    return {
-                        "total": total,
-                        "passed": passed,
-                        "failed": failed,
-                        "skipped": 0,
-                        "duration": 0,
-                    }
+                if returncode == 0 or returncode == 1:
+                    return self._parse_unittest_output(output)
         except (FileNotFoundError, subprocess.TimeoutExpired, Exception):
             pass
         
         return None
     
+    @staticmethod
+    def _parse_pytest_output(output) -> Optional[Dict[str, Any]]:
+        """Extract counts from the last pytest summary line in the (bytes) output"""
+        summary = None
+        for summary in _PYTEST_SUMMARY.finditer(output):
+            pass
+        if summary is None:
+            return None
+        
+        counts = {name: int(n) for n, name in _PYTEST_COUNT.findall(summary.group(1))}
+        passed = counts.get(b'passed', 0)
+        failed = counts.get(b'failed', 0) + counts.get(b'error', 0) + counts.get(b'errors', 0)
+        skipped = counts.get(b'skipped', 0)
+        total = passed + failed + skipped
+        if total == 0:
+            return None
+        
+        return {
+            "total": total,
+            "passed": passed,
+            "failed": failed,
+            "skipped": skipped,
+            "duration": float(summary.group(2)),
+        }
+    
+    @staticmethod
+    def _parse_unittest_output(output) -> Optional[Dict[str, Any]]:
+        """Extract counts from the unittest footer in the (bytes) output"""
+        ran = _UNITTEST_RAN.search(output)
+        if ran is None:
+            return None
+        total = int(ran.group(1))
+        if total == 0:
+            return None
+        
+        failed = 0
+        skipped = 0
+        status = _UNITTEST_STATUS.search(output, ran.end())
+        if status is not None and status.group(2):
+            # Keys are matched whole so "expected failures" (which pass) is not read as "failures"
+            counts = {}
+            for part in status.group(2).split(b', '):
+                name, _, n = part.partition(b'=')
+                if n.isdigit():
+                    counts[name.strip()] = int(n)
+            failed = counts.get(b'failures', 0) + counts.get(b'errors', 0) + counts.get(b'unexpected successes', 0)
+            skipped = counts.get(b'skipped', 0)
+        elif status is not None and status.group(1) == b'FAILED':
+            failed = total
+        
+        return {
+            "total": total,
+            "passed": total - failed - skipped,
+            "failed": failed,
+            "skipped": skipped,
+            "duration": float(ran.group(2)),
+        }
+    
+    @cached_property
+    def _coverage_files(self) -> frozenset:
+        """Coverage-related files present, as repo-relative POSIX paths.
+        
+        One directory scan of the repo root plus coverage/ and .nyc_output/ when
+        present, shared by all report parsers instead of per-candidate stat calls.
+        """
+        present = set()
+        for subdir in ("", "coverage", ".nyc_output"):
+            if subdir and subdir not in present:
+                continue
+            try:
+                with os.scandir(self.repo_path / subdir) as entries:
+                    for entry in entries:
+                        present.add(f"{subdir}/{entry.name}" if subdir else entry.name)
+            except OSError:
+                continue
+        return frozenset(present)
+    
     def _parse_jest_coverage(self) -> Optional[Dict[str, Any]]:
         """Parse Jest coverage report"""
         coverage_paths = [
-            self.repo_path / "coverage" / "coverage-summary.json",
-            self.repo_path / "coverage-summary.json",
+            "coverage/coverage-summary.json",
+            "coverage-summary.json",
         ]
         
-        for path in coverage_paths:
-            if path.exists():
+        for rel_path in coverage_paths:
+            if rel_path in self._coverage_files:
                 try:
-                    with open(path, 'r') as f:
-                        coverage_data = json.load(f)
-                        total = coverage_data.get("total", {})
-                        return {
-                            "lines": total.get("lines", {}).get("pct", 0),
-                            "statements": total.get("statements", {}).get("pct", 0),
-                            "functions": total.get("functions", {}).get("pct", 0),
-                            "branches": total.get("branches", {}).get("pct", 0),
-                        }
+                    coverage_data = json_utils.load_file(self.repo_path / rel_path)
+                    total = coverage_data.get("total", {})
+                    return {
+                        "lines": total.get("lines", {}).get("pct", 0),
+                        "statements": total.get("statements", {}).get("pct", 0),
+                        "functions": total.get("functions", {}).get("pct", 0),
+                        "branches": total.get("branches", {}).get("pct", 0),
+                    }
                 except Exception:
                     pass
         
@@ -368,33 +608,23 @@ class QualityAnalyzer:
     
     def _parse_pytest_coverage(self) -> Optional[Dict[str, Any]]:
         """Parse pytest-cov coverage report"""
-        coverage_paths = [
-            self.repo_path / ".coverage",
-            self.repo_path / "htmlcov" / "index.html",
-            self.repo_path / "coverage.xml",
-        ]
-        
         # Try to read coverage.xml (Cobertura format)
         xml_path = self.repo_path / "coverage.xml"
-        if xml_path.exists():
+        if "coverage.xml" in self._coverage_files:
             try:
-                tree = ET.parse(xml_path)
-                root = tree.getroot()
-                
-                # Cobertura XML format
-                line_rate = float(root.get("line-rate", 0)) * 100
-                branch_rate = float(root.get("branch-rate", 0)) * 100
-                
-                return {
-                    "lines": line_rate,
-                    "branches": branch_rate,
-                    "statements": line_rate,  # Approximate
-                    "functions": line_rate,  # Approximate
-                }
-            except Exception:
+                # Only the root element's attributes are needed: stop at the first start event
+                # instead of building the whole tree (reports can be hundreds of MB)
+                context = ET.iterparse(str(xml_path), events=('start',))
+                _, root = next(context)
+                del context
+                return self._cobertura_summary(root)
+            except (ET.ParseError, OSError, ValueError):
                 pass
         
-        # Try to run coverage report command
+        # Try to run coverage report command (needs a .coverage data file)
+        if ".coverage" not in self._coverage_files or not _which('coverage'):
+            return None
+        
         try:
             result = subprocess.run(
                 ['coverage', 'report', '--format=json'],
@@ -406,7 +636,7 @@ class QualityAnalyzer:
             
             if result.returncode == 0:
                 try:
-                    coverage_data = json.loads(result.stdout)
+                    coverage_data = json_utils.loads(result.stdout)
                     totals = coverage_data.get("totals", {})
                     return {
                         "lines": totals.get("percent_covered", 0),
@@ -421,32 +651,48 @@ class QualityAnalyzer:
         
         return None
     
-    def _find_existing_coverage(self) -> Optional[Dict[str, Any]]:
-        """Try to find existing coverage reports from various tools"""
+    @staticmethod
+    def _cobertura_summary(root: ET.Element) -> Dict[str, float]:
+        """Coverage percentages from a Cobertura root element (ValueError on bad rates)"""
+        line_rate: float = float(root.get("line-rate", 0)) * 100
+        branch_rate: float = float(root.get("branch-rate", 0)) * 100
+        return {
+            "lines": line_rate,
+            "branches": branch_rate,
+            "statements": line_rate,  # Approximate
+            "functions": line_rate,  # Approximate
+        }
+    
+    def _find_existing_coverage(self, skip: frozenset = frozenset()) -> Optional[Dict[str, Any]]:
+        """Try to find existing coverage reports from various tools
+        
+        skip holds frameworks whose coverage format was already parsed this run.
+        """
         # Try Jest/Vitest format
-        coverage = self._parse_jest_coverage()
-        if coverage:
-            return coverage
+        if not skip & {"jest", "vitest"}:
+            coverage = self._parse_jest_coverage()
+            if coverage:
+                return coverage
         
         # Try pytest format
-        coverage = self._parse_pytest_coverage()
-        if coverage:
-            return coverage
+        if "pytest" not in skip:
+            coverage = self._parse_pytest_coverage()
+            if coverage:
+                return coverage
         
         # Try Istanbul/NYC (Node.js)
         nyc_path = self.repo_path / ".nyc_output" / "coverage.json"
-        if nyc_path.exists():
+        if ".nyc_output/coverage.json" in self._coverage_files:
             try:
-                with open(nyc_path, 'r') as f:
-                    nyc_data = json.load(f)
-                    # Parse NYC format
-                    return {
-                        "lines": 0,  # Would need to calculate
-                        "statements": 0,
-                        "functions": 0,
-                        "branches": 0,
-                        "note": "NYC coverage found but parsing not fully implemented"
-                    }
+                nyc_data = json_utils.load_file(nyc_path)
+                # Parse NYC format
+                return {
+                    "lines": 0,  # Would need to calculate
+                    "statements": 0,
+                    "functions": 0,
+                    "branches": 0,
+                    "note": "NYC coverage found but parsing not fully implemented"
+                }
             except Exception:
                 pass
         
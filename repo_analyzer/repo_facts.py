@@ -1,9 +1,12 @@
 """Repository facts collector"""
 
 import os
+import configparser
+import shutil
+import subprocess
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Any, Optional
-import git
+from typing import Dict, Any, Optional, Tuple
 
 
 class RepoFactsCollector:
@@ -12,7 +15,124 @@ class RepoFactsCollector:
     def __init__(self, repo_path: str):
         self.repo_path = Path(repo_path)
     
-    def collect(self, repo_name: Optional[str] = None, 
+    @cached_property
+    def _git_dir(self) -> Optional[Path]:
+        """Plain .git directory, or None (no git, or a worktree/submodule .git file)"""
+        git_dir = self.repo_path / ".git"
+        return git_dir if git_dir.is_dir() else None
+    
+    @cached_property
+    def _git_cli_facts(self) -> Optional[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """(sha, branch, origin url) from the git binary, for layouts without a plain .git dir.
+        
+        Two forks total: one rev-parse for SHA and branch, one for the remote URL.
+        None when git is not installed.
+        """
+        sha = branch = url = None
+        if not self._has_git():
+            # Not a repository root: don't let git pick up a parent repository
+            return sha, branch, url
+        if not shutil.which("git"):
+            return None
+        
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.repo_path), "rev-parse", "HEAD", "--abbrev-ref", "HEAD"],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            if result.returncode == 0:
+                lines = result.stdout.split()
+                if len(lines) == 2:
+                    sha = lines[0]
+                    # Detached HEAD reports "HEAD" as its abbreviated ref
+                    branch = lines[1] if lines[1] != "HEAD" else None
+            
+            result = subprocess.run(
+                ["git", "-C", str(self.repo_path), "remote", "get-url", "origin"],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            if result.returncode == 0:
+                url = result.stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            pass
+        return sha, branch, url
+    
+    @cached_property
+    def _repo(self):
+        """Open the git repository with GitPython (fallback only; None if unavailable)"""
+        try:
+            import git
+            return git.Repo(self.repo_path)
+        except Exception:
+            return None
+    
+    @cached_property
+    def _head(self) -> Tuple[Optional[str], Optional[str]]:
+        """(commit sha, branch) read straight from .git/HEAD and the refs"""
+        git_dir = self._git_dir
+        if git_dir is None:
+            return None, None
+        
+        try:
+            head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:
+            return None, None
+        
+        if not head.startswith("ref:"):
+            # Detached HEAD holds the SHA itself
+            return head or None, None
+        
+        ref = head[4:].strip()
+        branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else None
+        return self._resolve_ref(git_dir, ref), branch
+    
+    @staticmethod
+    def _resolve_ref(git_dir: Path, ref: str) -> Optional[str]:
+        """Resolve a ref to its SHA via the loose ref file, then packed-refs"""
+        try:
+            return (git_dir / ref).read_text(encoding="utf-8").strip() or None
+        except OSError:
+            pass
+        
+        try:
+            with open(git_dir / "packed-refs", "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(("#", "^")):
+                        continue
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        except OSError:
+            pass
+        return None
+    
+    @cached_property
+    def _remote_url(self) -> Optional[str]:
+        """URL of the origin remote, shared by name and URL lookups"""
+        git_dir = self._git_dir
+        if git_dir is not None:
+            config = configparser.ConfigParser(strict=False, interpolation=None)
+            try:
+                config.read(git_dir / "config", encoding="utf-8")
+                return config.get('remote "origin"', "url", fallback=None)
+            except (configparser.Error, OSError):
+                pass
+        
+        if self._git_cli_facts is not None:
+            return self._git_cli_facts[2]
+        
+        try:
+            if self._repo is not None and self._repo.remotes:
+                return self._repo.remotes.origin.url
+        except Exception:
+            pass
+        return None
+    
+    def collect(self, repo_name: Optional[str] = None,
                 commit_sha: Optional[str] = None,
                 build_id: Optional[str] = None) -> Dict[str, Any]:
         """Collect repository facts"""
@@ -31,46 +151,50 @@ class RepoFactsCollector:
     def _get_repo_name(self) -> str:
         """Extract repository name from path or git"""
         # Try from git remote first
-        try:
-            repo = git.Repo(self.repo_path)
-            if repo.remotes:
-                remote_url = repo.remotes.origin.url
-                # Extract repo name from URL
-                if remote_url.endswith('.git'):
-                    remote_url = remote_url[:-4]
-                name = remote_url.split('/')[-1]
-                return name
-        except Exception:
-            pass
+        remote_url = self._remote_url
+        if remote_url:
+            # Extract repo name from URL
+            if remote_url.endswith('.git'):
+                remote_url = remote_url[:-4]
+            name = remote_url.split('/')[-1]
+            return name
         
         # Fallback to directory name
         return self.repo_path.name
     
     def _get_commit_sha(self) -> str:
         """Get current commit SHA"""
+        sha, _ = self._head
+        if sha:
+            return sha
+        
+        # Worktrees, submodules or unusual layouts: ask git, or GitPython without git
+        if self._git_cli_facts is not None:
+            return self._git_cli_facts[0] or "unknown"
         try:
-            repo = git.Repo(self.repo_path)
-            return repo.head.commit.hexsha
+            return self._repo.head.commit.hexsha
         except Exception:
             return "unknown"
     
     def _get_branch(self) -> str:
         """Get current branch"""
+        _, branch = self._head
+        if branch:
+            return branch
+        if self._git_dir is not None:
+            # Detached HEAD
+            return "unknown"
+        
+        if self._git_cli_facts is not None:
+            return self._git_cli_facts[1] or "unknown"
         try:
-            repo = git.Repo(self.repo_path)
-            return repo.active_branch.name
+            return self._repo.active_branch.name
         except Exception:
             return "unknown"
     
     def _get_repo_url(self) -> str:
         """Get repository URL from git remote"""
-        try:
-            repo = git.Repo(self.repo_path)
-            if repo.remotes:
-                return repo.remotes.origin.url
-        except Exception:
-            pass
-        return ""
+        return self._remote_url or ""
     
     def _has_git(self) -> bool:
         """Check if repository has git"""
@@ -1,15 +1,153 @@
 """Scoring system module for calculating VC-Ready Engineering Score"""
 
-import json
 import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from functools import lru_cache, partial
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from datetime import datetime, timezone, timedelta
 
+from . import json_utils
+
+
+# Feature commit messages (feat:, feature, new, add, implement); "feat" also covers "feature"
+_FEATURE_RE = re.compile(r'feat|new|add|implement', re.IGNORECASE)
+# Queue/worker dependencies; "bull" also covers "bullmq"
+_ASYNC_RE = re.compile(r'bull|rabbitmq|redis|queue|celery|kafka', re.IGNORECASE)
+
+# datetime.fromisoformat only accepts a trailing "Z" from Python 3.11
+_NEEDS_Z_FIX = sys.version_info < (3, 11)
+
+# Frameworks treated as a modern stack by the estimators
+_MODERN_STACKS = frozenset({"NestJS", "Next.js", "FastAPI"})
+
+# Sort key for (name, score) pairs
+_BY_VALUE = itemgetter(1)
+
+# Lowest score of each grade above "E", in ascending order
+_GRADE_BOUNDS = (60, 70, 80, 90)
+_GRADES = ("E", "D", "C", "B", "A")
+
+# Evidence files at least this large are streamed when only one field is needed
+_STREAM_MIN_BYTES = 32 * 1024
+
+# metrica.json shipped next to the package
+_PACKAGE_METRICA_JSON = Path(__file__).parent.parent / "metrica.json"
+
+# Fallback config when no metrica.json is found (shared: treat as read-only)
+_DEFAULT_METRICA_CONFIG = {
+    "scoring_model": {
+        "name": "VC-Ready Engineering Score",
+        "version": "1.0.0",
+        "scale": {"min": 0, "max": 100},
+        "final_score_weights": {
+            "velocity": 0.2,
+            "stability": 0.15,
+            "scalability": 0.15,
+            "security": 0.15,
+            "maintainability": 0.15,
+            "bus_factor": 0.1,
+            "governance": 0.1
+        },
+        "dimensions": []
+    }
+}
+
+
+def _parse_commit_date(date_str: Any) -> Optional[datetime]:
+    """Parse commit date string to an aware datetime (None for missing or non-string dates)"""
+    if not isinstance(date_str, str) or not date_str:
+        return None
+    return _parse_commit_date_str(date_str)
+
+
+@lru_cache(maxsize=8192)
+def _parse_commit_date_str(date_str: str) -> Optional[datetime]:
+    """Memoized parse of a non-empty date string (commits often share timestamps)"""
+    try:
+        date = datetime.fromisoformat(date_str.replace('Z', '+00:00') if _NEEDS_Z_FIX else date_str)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date
+
+
+def _dig(data: Any, path: Tuple[str, ...]) -> Any:
+    """Follow a field path through nested dicts (None if any step is missing)"""
+    for part in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+        if data is None:
+            return None
+    return data
+
+
+@lru_cache(maxsize=None)
+def _find_metrica_json(cwd: str, evidence_parent: Path) -> Optional[Path]:
+    """Locate metrica.json in the usual places (memoized per working dir and evidence pack parent)"""
+    # Look for metrica.json in repo root or current directory
+    possible_paths = [
+        Path(cwd) / "metrica.json",
+        Path(cwd).parent / "metrica.json",
+        evidence_parent / "metrica.json",
+        _PACKAGE_METRICA_JSON,
+    ]
+    for path in possible_paths:
+        if path.exists():
+            return path
+    return None
+
 
 class ScoringSystem:
     """Calculates product quality and engineering scores based on metrics"""
     
+    # Estimator method per (dimension key, metric key), used when a metric's source is missing
+    ESTIMATORS = {
+        ("velocity", "deploys_per_month"): "_estimate_deploys_per_month",
+        ("velocity", "lead_time_pr_to_prod_hours"): "_estimate_lead_time_pr_to_prod_hours",
+        ("velocity", "features_shipped_per_month"): "_estimate_features_shipped_per_month",
+        ("stability", "change_failure_rate_pct"): "_estimate_change_failure_rate_pct",
+        ("stability", "mttr_minutes"): "_estimate_mttr_minutes",
+        ("stability", "prod_incidents_last_30d"): "_estimate_prod_incidents_last_30d",
+        ("scalability", "stateless_services_pct"): "_estimate_stateless_services_pct",
+        ("scalability", "async_processing_present"): "_estimate_async_processing_present",
+        ("scalability", "autoscaling_configured"): "_estimate_autoscaling_configured",
+        ("security", "critical_cves_open"): "_estimate_critical_cves_open",
+        ("security", "secrets_detected"): "_estimate_secrets_detected",
+        ("maintainability", "sonar_maintainability_rating"): "_estimate_sonar_maintainability_rating",
+        ("maintainability", "duplication_pct"): "_estimate_duplication_pct",
+        ("maintainability", "coverage_core_pct"): "_estimate_coverage_core_pct",
+        ("bus_factor", "top1_author_share_pct"): "_estimate_top1_author_share_pct",
+        ("bus_factor", "active_maintainers_count"): "_estimate_active_maintainers_count",
+        ("governance", "ci_cd_present"): "_estimate_ci_cd_present",
+        ("governance", "onboarding_docs_present"): "_estimate_onboarding_docs_present",
+        ("governance", "runbooks_present"): "_estimate_runbooks_present",
+        ("governance", "adrs_present"): "_estimate_adrs_present",
+        ("governance", "evidence_per_build_published"): "_estimate_evidence_per_build_published",
+    }
+    
+    # Field mapping for common mismatches between metrica.json sources and evidence files:
+    # a field path tuple, or the name of a method computing the value from the file data
+    FIELD_MAPPING = {
+        "security/deps-sca.json": {
+            "critical_open": ("summary", "critical"),
+            "high_open": ("summary", "high"),
+            "medium_open": ("summary", "medium"),
+        },
+        "change/commits.json": {
+            "contributors.top1_share_pct": "_calculate_top1_share",
+            "contributors.active_maintainers_90d": "_calculate_active_maintainers",
+        },
+        "quality/coverage-summary.json": {
+            "core_modules_coverage_pct": ("lines",),
+        },
+    }
+    
     def __init__(self, evidence_pack_path: str, metrica_config_path: Optional[str] = None, 
                  stack_info: Optional[Dict[str, Any]] = None, repo_facts: Optional[Dict[str, Any]] = None,
                  metrics: Optional[Dict[str, Any]] = None):
@@ -17,72 +155,134 @@ class ScoringSystem:
         self.stack_info = stack_info or {}
         self.repo_facts = repo_facts or {}
         self.metrics = metrics or {}
+        # Stack flags used by the estimators, constant for the instance
+        self._frameworks_set = frozenset(self.stack_info.get("frameworks", []))
+        self._has_typescript = bool(self.stack_info.get("has_typescript", False))
+        self._has_modern_stack = not self._frameworks_set.isdisjoint(_MODERN_STACKS)
+        # Parsed evidence files by path (None for missing or invalid files)
+        self._json_cache: Dict[Path, Any] = {}
+        # (commits payload, aggregates) for the last payload passed to _commit_stats
+        self._commit_stats_cache: Optional[tuple] = None
+        # Entry names per scanned directory, for existence probes
+        self._dir_index: Dict[Path, frozenset] = {}
+        # Compiled threshold scorers by id(normalization), kept with the dict they describe
+        self._threshold_scorers: Dict[int, Tuple[Dict[str, Any], Callable[[float], float]]] = {}
+        # Reference time of the current calculate_scores run, and its 30/90-day cutoffs
+        self._now: Optional[datetime] = None
+        self._t30: Optional[datetime] = None
+        self._t90: Optional[datetime] = None
         
         # Load metrica config
         # Try to find metrica.json in common locations
         if metrica_config_path:
             config_path = Path(metrica_config_path)
         else:
-            # Look for metrica.json in repo root or current directory
-            possible_paths = [
-                Path("metrica.json"),
-                Path("../metrica.json"),
-                self.evidence_pack_path.parent / "metrica.json",
-                Path(__file__).parent.parent / "metrica.json",
-            ]
-            config_path = None
-            for path in possible_paths:
-                if path.exists():
-                    config_path = path
-                    break
+            config_path = _find_metrica_json(os.getcwd(), self.evidence_pack_path.parent)
         
-        if config_path and config_path.exists():
+        # Use default config unless the file can be read (no separate exists() check)
+        self.metrica_config = self._get_default_config()
+        if config_path:
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                    # Handle case where config is wrapped in a key
-                    if "scoring_model" in config_data:
-                        self.metrica_config = config_data
-                    elif "scoring_model" in config_data.get("scoring_model", {}):
-                        # Already wrapped
-                        self.metrica_config = config_data
-                    else:
-                        self.metrica_config = {"scoring_model": config_data}
-            except Exception:
-                self.metrica_config = self._get_default_config()
-        else:
-            # Use default config
-            self.metrica_config = self._get_default_config()
+                config_data = json_utils.load_file(config_path)
+            except (OSError, ValueError):
+                config_data = None
+            if isinstance(config_data, dict):
+                # Handle case where config is wrapped in a key
+                if "scoring_model" in config_data:
+                    self.metrica_config = config_data
+                else:
+                    self.metrica_config = {"scoring_model": config_data}
+        
+        self._prepare_config()
     
-    def _get_default_config(self) -> Dict[str, Any]:
+    @staticmethod
+    def _get_default_config() -> Dict[str, Any]:
         """Get default metrica configuration"""
-        # This would ideally load from metrica.json, but we'll use inline for now
         # The actual config should be loaded from metrica.json file
-        return {
-            "scoring_model": {
-                "name": "VC-Ready Engineering Score",
-                "version": "1.0.0",
-                "scale": {"min": 0, "max": 100},
-                "final_score_weights": {
-                    "velocity": 0.2,
-                    "stability": 0.15,
-                    "scalability": 0.15,
-                    "security": 0.15,
-                    "maintainability": 0.15,
-                    "bus_factor": 0.1,
-                    "governance": 0.1
-                },
-                "dimensions": []
-            }
-        }
+        return _DEFAULT_METRICA_CONFIG
+    
+    def _prepare_config(self) -> None:
+        """Precompute per-metric lookup data once the metrica config is loaded"""
+        for dimension in self.metrica_config.get("scoring_model", {}).get("dimensions", []):
+            dimension["_weighted_metrics"] = [
+                m for m in dimension.get("metrics", []) if m.get("metric_weight", 0) != 0
+            ]
+            for metric in dimension["_weighted_metrics"]:
+                source = metric.get("source")
+                if isinstance(source, dict) and isinstance(source.get("field"), str):
+                    source["_field_path"] = tuple(source["field"].split("."))
+                
+                normalization = metric.get("normalization", {})
+                if normalization.get("type") == "thresholds":
+                    try:
+                        self._threshold_scorer(normalization)
+                    except (TypeError, ValueError):
+                        # Malformed thresholds: left to fail at scoring time as before
+                        pass
+    
+    def invalidate_cache(self) -> None:
+        """Forget parsed evidence files so they are read again"""
+        self._json_cache.clear()
+        self._commit_stats_cache = None
+        self._dir_index.clear()
+    
+    def _load_json(self, path: Path) -> Any:
+        """Parse an evidence pack JSON file, once per scoring run (None if missing or invalid)"""
+        if path not in self._json_cache:
+            try:
+                self._json_cache[path] = json_utils.load_file(path)
+            except (OSError, ValueError):
+                self._json_cache[path] = None
+        return self._json_cache[path]
+    
+    def _read_field(self, path: Path, field_path: Tuple[str, ...]) -> Any:
+        """Read one field from an evidence JSON file (None if missing)
+        
+        Large files that have not been parsed yet are streamed for a scalar field, so
+        e.g. the vulnerability list in deps-sca.json is never built just for its summary.
+        """
+        if path not in self._json_cache and json_utils.IJSON_AVAILABLE:
+            key = ".".join(field_path)
+            try:
+                if path.stat().st_size >= _STREAM_MIN_BYTES:
+                    with open(path, 'rb') as f:
+                        found = json_utils.load_fields(f, (key,))
+                    if key in found:
+                        return found[key]
+                    # Missing or not a scalar: fall back to a full parse
+            except (OSError, ValueError):
+                pass
+        return _dig(self._load_json(path), field_path)
+    
+    def _scan_dir(self, directory: Path) -> frozenset:
+        """Names of the entries in a directory, listed once per scoring run"""
+        names = self._dir_index.get(directory)
+        if names is None:
+            try:
+                with os.scandir(directory) as entries:
+                    names = frozenset(entry.name for entry in entries)
+            except OSError:
+                names = frozenset()
+            self._dir_index[directory] = names
+        return names
+    
+    def _exists(self, path: Path) -> bool:
+        """Check if a file or directory exists using the cached directory listing"""
+        return path.name in self._scan_dir(path.parent)
     
     def calculate_scores(self, repo_name: str, commit_sha: str) -> Dict[str, Any]:
         """Calculate all dimension scores and final score"""
-        scores = {}
-        
+        self._set_now(datetime.now(timezone.utc))
         dimensions_config = self.metrica_config.get("scoring_model", {}).get("dimensions", [])
+        if not dimensions_config:
+            # Nothing to score (e.g. the default config)
+            return self._empty_result(repo_name, commit_sha)
         weights = self.metrica_config.get("scoring_model", {}).get("final_score_weights", {})
         
+        # Evidence files may have changed since a previous run
+        self.invalidate_cache()
+        scores = {}
+        
         # Calculate score for each dimension
         for dimension in dimensions_config:
             dimension_key = dimension.get("key")
@@ -107,7 +307,7 @@ class ScoringSystem:
         result = {
             "repo": repo_name,
             "commit": commit_sha,
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": self._now.isoformat(),
             "scores": scores,
             "final_score": round(final_score, 2),
             "product_quality": {
@@ -120,9 +320,34 @@ class ScoringSystem:
         
         return result
     
+    def _set_now(self, now: datetime) -> None:
+        """Fix the reference time (and activity cutoffs) used by the estimators"""
+        self._now = now
+        self._t30 = now - timedelta(days=30)
+        self._t90 = now - timedelta(days=90)
+    
+    def _empty_result(self, repo_name: str, commit_sha: str) -> Dict[str, Any]:
+        """Zero result for a config without dimensions, built without reading any evidence"""
+        return {
+            "repo": repo_name,
+            "commit": commit_sha,
+            "generated_at": self._now.isoformat(),
+            "scores": {},
+            "final_score": 0.0,
+            "product_quality": {
+                "rating": self._calculate_product_quality_rating({}),
+                "scale": {"min": 1, "max": 10}
+            },
+            "grade": self._score_to_grade(0.0),
+            "notes": self._generate_notes({}, 0.0)
+        }
+    
     def _calculate_dimension_score(self, dimension: Dict[str, Any]) -> float:
         """Calculate score for a single dimension"""
-        metrics = dimension.get("metrics", [])
+        # Zero-weight metrics cannot change the score: skip reading and normalizing them
+        metrics = dimension.get("_weighted_metrics")
+        if metrics is None:
+            metrics = [m for m in dimension.get("metrics", []) if m.get("metric_weight", 0) != 0]
         if not metrics:
             return 0.0
         
@@ -166,293 +391,214 @@ class ScoringSystem:
     
     def _estimate_metric_value(self, metric_key: str, metric: Dict[str, Any], dimension: Dict[str, Any]) -> Any:
         """Estimate metric value from available data when direct source is not available"""
-        # Try to estimate based on available evidence pack data
-        dimension_key = dimension.get("key")
-        
-        # Velocity dimension estimations
-        if dimension_key == "velocity":
-            if metric_key == "deploys_per_month":
-                # Estimate based on commit frequency and tech stack
-                commits_file = self.evidence_pack_path / "change" / "commits.json"
-                if commits_file.exists():
-                    try:
-                        with open(commits_file, 'r') as f:
-                            data = json.load(f)
-                            recent_commits = data.get("recent_commits", [])
-                            if recent_commits:
-                                # Count commits in last 30 days
-                                from datetime import datetime, timedelta, timezone
-                                now = datetime.now(timezone.utc)
-                                days_30_ago = now - timedelta(days=30)
-                                
-                                commits_30d = sum(1 for c in recent_commits 
-                                                 if self._parse_commit_date(c.get("date", "")) >= days_30_ago)
-                                
-                                # Modern frameworks like NestJS typically have faster deployment
-                                frameworks = self.stack_info.get("frameworks", [])
-                                has_modern_stack = any(f in ["NestJS", "Next.js", "FastAPI"] for f in frameworks)
-                                
-                                # Estimate deploys: if many commits and modern stack, likely frequent deploys
-                                if commits_30d >= 20 and has_modern_stack:
-                                    return 10  # Good velocity
-                                elif commits_30d >= 10:
-                                    return 4   # Moderate velocity
-                                elif commits_30d >= 5:
-                                    return 1   # Low velocity
-                    except:
-                        pass
-                
-                # Default: modern stack = moderate velocity assumption
-                frameworks = self.stack_info.get("frameworks", [])
-                if any(f in ["NestJS", "Next.js", "FastAPI"] for f in frameworks):
-                    return 4  # Assume moderate deployment frequency
-                return 0
-                
-            elif metric_key == "lead_time_pr_to_prod_hours":
-                # Estimate based on tech stack maturity
-                frameworks = self.stack_info.get("frameworks", [])
-                has_modern_stack = any(f in ["NestJS", "Next.js", "FastAPI"] for f in frameworks)
-                has_typescript = self.stack_info.get("has_typescript", False)
-                
-                if has_modern_stack and has_typescript:
-                    return 24  # Modern stack = faster CI/CD typically
-                elif has_modern_stack:
-                    return 48
-                else:
-                    return 96  # Older stack = slower typically
-            
-            elif metric_key == "features_shipped_per_month":
-                # Estimate based on commits and activity
-                commits_file = self.evidence_pack_path / "change" / "commits.json"
-                if commits_file.exists():
-                    try:
-                        with open(commits_file, 'r') as f:
-                            data = json.load(f)
-                            recent_commits = data.get("recent_commits", [])
-                            if recent_commits:
-                                # Look for feature commits (feat:, feature, new, add)
-                                feature_keywords = ["feat", "feature", "new", "add", "implement"]
-                                feature_commits = sum(1 for c in recent_commits[:20]
-                                                     if any(kw in c.get("message", "").lower() for kw in feature_keywords))
-                                return min(feature_commits, 12)  # Cap at 12
-                    except:
-                        pass
-                return 2  # Default moderate
-        
-        # Stability dimension estimations
-        elif dimension_key == "stability":
-            if metric_key == "change_failure_rate_pct":
-                # Estimate based on architecture quality
-                # Modern frameworks with good structure = lower failure rate
-                frameworks = self.stack_info.get("frameworks", [])
-                has_typescript = self.stack_info.get("has_typescript", False)
-                
-                if "NestJS" in frameworks and has_typescript:
-                    return 5  # Good architecture = low failure rate
-                elif has_typescript:
-                    return 10
-                else:
-                    return 15  # Default moderate
-                    
-            elif metric_key == "mttr_minutes":
-                # Modern stack = faster recovery
-                frameworks = self.stack_info.get("frameworks", [])
-                if "NestJS" in frameworks:
-                    return 60  # Good recovery time
-                return 120  # Default moderate
-                
-            elif metric_key == "prod_incidents_last_30d":
-                # Default to low if no data (assume stable)
-                return 0
-        
-        # Scalability dimension estimations
-        elif dimension_key == "scalability":
-            if metric_key == "stateless_services_pct":
-                # Detect if using microservices/modular architecture
-                frameworks = self.stack_info.get("frameworks", [])
-                
-                # NestJS with modules = good stateless architecture
-                if "NestJS" in frameworks:
-                    # Check if has multiple modules/files (indicates modularity)
-                    files_count = self.metrics.get("files", 0)
-                    if files_count > 20:
-                        return 90  # NestJS with many files = modular
-                    return 75
-                
-                # Express or similar = could be stateless
-                if "Express" in frameworks:
-                    return 70
-                
-                return 60  # Default moderate
-                
-            elif metric_key == "async_processing_present":
-                # Check dependencies for queue/worker libraries
-                deps_file = self.evidence_pack_path / "dependencies.json"
-                if deps_file.exists():
-                    try:
-                        with open(deps_file, 'r') as f:
-                            deps = json.load(f)
-                            dep_names = [d.get("name", "").lower() for d in deps.get("dependencies", [])]
-                            # Check for async/queue libraries
-                            async_keywords = ["bull", "bullmq", "rabbitmq", "redis", "queue", "celery", "kafka"]
-                            if any(kw in " ".join(dep_names) for kw in async_keywords):
-                                return True
-                    except:
-                        pass
+        estimator = self.ESTIMATORS.get((dimension.get("key"), metric_key))
+        if estimator is None:
+            return None  # Could not estimate
+        return getattr(self, estimator)()
+    
+    # Velocity dimension estimations
+    def _estimate_deploys_per_month(self) -> int:
+        """Estimate based on commit frequency and tech stack"""
+        data = self._load_json(self.evidence_pack_path / "change" / "commits.json")
+        if data is not None:
+            try:
+                # Commits in last 30 days
+                commits_30d = self._commit_stats(data)["commits_30d"]
                 
-                # Check repo name or structure hints
-                repo_name = self.repo_facts.get("name", "").lower()
-                if any(kw in repo_name for kw in ["scheduler", "worker", "queue", "job"]):
+                # Estimate deploys: if many commits and modern stack (NestJS and the like
+                # typically deploy faster), likely frequent deploys
+                if commits_30d >= 20 and self._has_modern_stack:
+                    return 10  # Good velocity
+                elif commits_30d >= 10:
+                    return 4   # Moderate velocity
+                elif commits_30d >= 5:
+                    return 1   # Low velocity
+            except:
+                pass
+        
+        # Default: modern stack = moderate velocity assumption
+        if self._has_modern_stack:
+            return 4  # Assume moderate deployment frequency
+        return 0
+    
+    def _estimate_lead_time_pr_to_prod_hours(self) -> int:
+        """Estimate based on tech stack maturity"""
+        if self._has_modern_stack and self._has_typescript:
+            return 24  # Modern stack = faster CI/CD typically
+        elif self._has_modern_stack:
+            return 48
+        else:
+            return 96  # Older stack = slower typically
+    
+    def _estimate_features_shipped_per_month(self) -> int:
+        """Estimate based on commits and activity"""
+        data = self._load_json(self.evidence_pack_path / "change" / "commits.json")
+        if data is not None:
+            try:
+                if data.get("recent_commits"):
+                    feature_commits = self._commit_stats(data)["feature_commits"]
+                    return min(feature_commits, 12)  # Cap at 12
+            except:
+                pass
+        return 2  # Default moderate
+    
+    # Stability dimension estimations
+    def _estimate_change_failure_rate_pct(self) -> int:
+        """Estimate based on architecture quality"""
+        # Modern frameworks with good structure = lower failure rate
+        if "NestJS" in self._frameworks_set and self._has_typescript:
+            return 5  # Good architecture = low failure rate
+        elif self._has_typescript:
+            return 10
+        else:
+            return 15  # Default moderate
+    
+    def _estimate_mttr_minutes(self) -> int:
+        """Modern stack = faster recovery"""
+        if "NestJS" in self._frameworks_set:
+            return 60  # Good recovery time
+        return 120  # Default moderate
+    
+    def _estimate_prod_incidents_last_30d(self) -> int:
+        """Default to low if no data (assume stable)"""
+        return 0
+    
+    # Scalability dimension estimations
+    def _estimate_stateless_services_pct(self) -> int:
+        """Detect if using microservices/modular architecture"""
+        # NestJS with modules = good stateless architecture
+        if "NestJS" in self._frameworks_set:
+            # Check if has multiple modules/files (indicates modularity)
+            files_count = self.metrics.get("files", 0)
+            if files_count > 20:
+                return 90  # NestJS with many files = modular
+            return 75
+        
+        # Express or similar = could be stateless
+        if "Express" in self._frameworks_set:
+            return 70
+        
+        return 60  # Default moderate
+    
+    def _estimate_async_processing_present(self) -> bool:
+        """Check dependencies for queue/worker libraries"""
+        deps = self._load_json(self.evidence_pack_path / "dependencies.json")
+        if deps is not None:
+            try:
+                # Check for async/queue libraries
+                if any(_ASYNC_RE.search(d.get("name", "")) for d in deps.get("dependencies", [])):
                     return True
-                
-                return False
-                
-            elif metric_key == "autoscaling_configured":
-                # Check for k8s/docker configs (would need to scan files, but default False for now)
-                return False
-        
-        # Security dimension estimations
-        elif dimension_key == "security":
-            if metric_key == "critical_cves_open":
-                # Try to get from security summary
-                security_file = self.evidence_pack_path / "security" / "deps-sca.json"
-                if security_file.exists():
-                    try:
-                        with open(security_file, 'r') as f:
-                            data = json.load(f)
-                            return data.get("summary", {}).get("critical", 0)
-                    except:
-                        pass
-                return 0  # No critical CVEs = good
-            elif metric_key == "secrets_detected":
-                # Check if there's a secrets file
-                secrets_file = self.evidence_pack_path / "security" / "secrets.json"
-                if secrets_file.exists():
-                    try:
-                        with open(secrets_file, 'r') as f:
-                            data = json.load(f)
-                            return data.get("secrets_found", 0)
-                    except:
-                        pass
-                return 0  # No secrets found = good
-        
-        # Maintainability dimension estimations
-        elif dimension_key == "maintainability":
-            if metric_key == "coverage_core_pct":
-                # Try to get from coverage summary
-                coverage_file = self.evidence_pack_path / "quality" / "coverage-summary.json"
-                if coverage_file.exists():
-                    try:
-                        with open(coverage_file, 'r') as f:
-                            data = json.load(f)
-                            # Check if data has coverage info
-                            if data and "lines" in data:
-                                return data.get("lines", 0)
-                    except:
-                        pass
-                # Default: no coverage = 0%
-                return 0
-        
-        # Bus factor dimension estimations
-        elif dimension_key == "bus_factor":
-            if metric_key in ["top1_author_share_pct", "active_maintainers_count"]:
-                # Calculate from commits if available
-                commits_file = self.evidence_pack_path / "change" / "commits.json"
-                if commits_file.exists():
-                    try:
-                        with open(commits_file, 'r') as f:
-                            data = json.load(f)
-                            if metric_key == "top1_author_share_pct":
-                                return self._calculate_top1_share(data)
-                            elif metric_key == "active_maintainers_count":
-                                return self._calculate_active_maintainers(data)
-                    except:
-                        pass
+            except:
+                pass
         
-        # Governance dimension estimations
-        elif dimension_key == "governance":
-            if metric_key == "ci_cd_present":
-                # Check if has CI/CD based on repo structure or build info
-                build_file = self.evidence_pack_path / "build" / "build.json"
-                if build_file.exists():
-                    try:
-                        with open(build_file, 'r') as f:
-                            build_data = json.load(f)
-                            if build_data.get("ci_cd"):
-                                return True
-                    except:
-                        pass
-                
-                # Check if has common CI/CD files (would need to check repo, but assume True if build.json exists)
-                return build_file.exists()
-                
-            elif metric_key == "onboarding_docs_present":
-                # Check if README exists in docs
-                readme_file = self.evidence_pack_path / "docs" / "README.enriched.md"
-                return readme_file.exists()
-            elif metric_key == "runbooks_present":
-                # Check if runbook exists
-                runbook_file = self.evidence_pack_path / "docs" / "runbook.md"
-                return runbook_file.exists()
-            elif metric_key == "adrs_present":
-                # Check for ADR directory
-                repo_root = self.evidence_pack_path.parent
-                adr_dirs = ["docs/adr", "adr", "docs/decisions"]
-                return any((repo_root / d).exists() for d in adr_dirs)
-            elif metric_key == "evidence_per_build_published":
-                # Check if build.json exists
-                build_file = self.evidence_pack_path / "build" / "build.json"
-                return build_file.exists()
-        
-        # Maintainability dimension estimations
-        elif dimension_key == "maintainability":
-            if metric_key == "sonar_maintainability_rating":
-                # Estimate based on code quality indicators
-                frameworks = self.stack_info.get("frameworks", [])
-                has_typescript = self.stack_info.get("has_typescript", False)
-                
-                # Modern stack with TypeScript = good maintainability
-                if "NestJS" in frameworks and has_typescript:
-                    return "B"  # Good rating
-                elif has_typescript:
-                    return "C"  # Moderate
-                else:
-                    return "C"  # Default moderate
-                    
-            elif metric_key == "duplication_pct":
-                # Estimate based on framework quality
-                # Modern frameworks encourage DRY principles
-                frameworks = self.stack_info.get("frameworks", [])
-                if "NestJS" in frameworks:
-                    return 3  # Low duplication
-                return 8  # Default moderate
-                
-            elif metric_key == "coverage_core_pct":
-                # Try to get from coverage file, or estimate based on test files
-                coverage_file = self.evidence_pack_path / "quality" / "coverage-summary.json"
-                if coverage_file.exists():
-                    try:
-                        with open(coverage_file, 'r') as f:
-                            data = json.load(f)
-                            if data and "lines" in data:
-                                return data.get("lines", 0)
-                    except:
-                        pass
-                return 0  # No coverage = 0
+        # Check repo name or structure hints
+        repo_name = self.repo_facts.get("name", "").lower()
+        if any(kw in repo_name for kw in ["scheduler", "worker", "queue", "job"]):
+            return True
         
-        return None  # Could not estimate
+        return False
     
-    def _parse_commit_date(self, date_str: str) -> Optional[datetime]:
-        """Parse commit date string to datetime"""
-        if not date_str:
-            return None
+    def _estimate_autoscaling_configured(self) -> bool:
+        """Check for k8s/docker configs (would need to scan files, but default False for now)"""
+        return False
+    
+    # Security dimension estimations
+    def _estimate_critical_cves_open(self) -> int:
+        """Try to get from security summary"""
+        critical = self._read_field(self.evidence_pack_path / "security" / "deps-sca.json",
+                                    ("summary", "critical"))
+        if critical is not None:
+            return critical
+        return 0  # No critical CVEs = good
+    
+    def _estimate_secrets_detected(self) -> int:
+        """Check if there's a secrets file"""
+        secrets_found = self._read_field(self.evidence_pack_path / "security" / "secrets.json",
+                                         ("secrets_found",))
+        if secrets_found is not None:
+            return secrets_found
+        return 0  # No secrets found = good
+    
+    # Maintainability dimension estimations
+    def _estimate_sonar_maintainability_rating(self) -> str:
+        """Estimate based on code quality indicators"""
+        # Modern stack with TypeScript = good maintainability
+        if "NestJS" in self._frameworks_set and self._has_typescript:
+            return "B"  # Good rating
+        return "C"  # Moderate
+    
+    def _estimate_duplication_pct(self) -> int:
+        """Estimate based on framework quality"""
+        # Modern frameworks encourage DRY principles
+        if "NestJS" in self._frameworks_set:
+            return 3  # Low duplication
+        return 8  # Default moderate
+    
+    def _estimate_coverage_core_pct(self) -> Any:
+        """Try to get from coverage summary"""
+        data = self._load_json(self.evidence_pack_path / "quality" / "coverage-summary.json")
         try:
-            date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            if date.tzinfo is None:
-                date = date.replace(tzinfo=timezone.utc)
-            return date
+            # Check if data has coverage info
+            if data and "lines" in data:
+                return data.get("lines", 0)
         except:
-            return None
+            pass
+        # Default: no coverage = 0%
+        return 0
+    
+    # Bus factor dimension estimations (calculated from commits if available)
+    def _estimate_top1_author_share_pct(self) -> Optional[float]:
+        """Top author share of recent commits"""
+        data = self._load_json(self.evidence_pack_path / "change" / "commits.json")
+        if data is not None:
+            try:
+                return self._calculate_top1_share(data)
+            except:
+                pass
+        return None
+    
+    def _estimate_active_maintainers_count(self) -> Optional[int]:
+        """Authors active in the last 90 days"""
+        data = self._load_json(self.evidence_pack_path / "change" / "commits.json")
+        if data is not None:
+            try:
+                return self._calculate_active_maintainers(data)
+            except:
+                pass
+        return None
+    
+    # Governance dimension estimations
+    def _estimate_ci_cd_present(self) -> bool:
+        """Check if has CI/CD based on repo structure or build info"""
+        build_file = self.evidence_pack_path / "build" / "build.json"
+        build_data = self._load_json(build_file)
+        if build_data is not None:
+            try:
+                if build_data.get("ci_cd"):
+                    return True
+            except:
+                pass
+        
+        # Check if has common CI/CD files (would need to check repo, but assume True if build.json exists)
+        return self._exists(build_file)
+    
+    def _estimate_onboarding_docs_present(self) -> bool:
+        """Check if README exists in docs"""
+        return "README.enriched.md" in self._scan_dir(self.evidence_pack_path / "docs")
+    
+    def _estimate_runbooks_present(self) -> bool:
+        """Check if runbook exists"""
+        return "runbook.md" in self._scan_dir(self.evidence_pack_path / "docs")
+    
+    def _estimate_adrs_present(self) -> bool:
+        """Check for ADR directory (adr, docs/adr or docs/decisions)"""
+        repo_root = self.evidence_pack_path.parent
+        return ("adr" in self._scan_dir(repo_root)
+                or not self._scan_dir(repo_root / "docs").isdisjoint(("adr", "decisions")))
+    
+    def _estimate_evidence_per_build_published(self) -> bool:
+        """Check if build.json exists"""
+        return "build.json" in self._scan_dir(self.evidence_pack_path / "build")
     
     def _get_metric_value(self, source: Dict[str, Any]) -> Any:
         """Get metric value from evidence pack file with field mapping"""
@@ -465,61 +611,32 @@ class ScoringSystem:
         if not source_path or not source_field:
             return None
         
+        # Nested field paths (e.g., "summary.total") are pre-split by _prepare_config
+        field_path = source.get("_field_path") or tuple(source_field.split("."))
+        
         # Construct full path
         file_path = self.evidence_pack_path / source_path
         
-        if not file_path.exists():
+        if not self._exists(file_path):
             # Try alternative paths or field mappings
-            return self._get_metric_value_fallback(source_path, source_field)
+            return self._get_metric_value_fallback(source_path, field_path)
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Field mapping for common mismatches
-            field_mapping = {
-                "security/deps-sca.json": {
-                    "critical_open": "summary.critical",
-                    "high_open": "summary.high",
-                    "medium_open": "summary.medium",
-                },
-                "change/commits.json": {
-                    "contributors.top1_share_pct": self._calculate_top1_share,
-                    "contributors.active_maintainers_90d": self._calculate_active_maintainers,
-                },
-                "quality/coverage-summary.json": {
-                    "core_modules_coverage_pct": "lines",
-                },
-            }
-            
             # Check if there's a mapping for this file/field
-            if source_path in field_mapping and source_field in field_mapping[source_path]:
-                mapped = field_mapping[source_path][source_field]
-                if callable(mapped):
-                    # It's a function to calculate the value
-                    return mapped(data)
-                else:
-                    # It's a different field path
-                    source_field = mapped
+            mapped = self.FIELD_MAPPING.get(source_path, {}).get(source_field)
+            if isinstance(mapped, str):
+                # It's a method to calculate the value from the whole file
+                data = self._load_json(file_path)
+                return getattr(self, mapped)(data) if data is not None else None
+            elif mapped:
+                # It's a different field path
+                field_path = mapped
             
-            # Handle nested field paths (e.g., "summary.total" or "contributors.top1_share_pct")
-            if "." in source_field:
-                parts = source_field.split(".")
-                value = data
-                for part in parts:
-                    if isinstance(value, dict):
-                        value = value.get(part)
-                    else:
-                        return None
-                    if value is None:
-                        return None
-                return value
-            else:
-                return data.get(source_field)
+            return self._read_field(file_path, field_path)
         except Exception:
             return None
     
-    def _get_metric_value_fallback(self, source_path: str, source_field: str) -> Any:
+    def _get_metric_value_fallback(self, source_path: str, field_path: Tuple[str, ...]) -> Any:
         """Try to get metric value from alternative sources"""
         # Try alternative field paths
         alternative_paths = {
@@ -531,97 +648,82 @@ class ScoringSystem:
         if source_path in alternative_paths:
             for alt_path in alternative_paths[source_path]:
                 alt_file = self.evidence_pack_path / alt_path
-                if alt_file.exists():
-                    try:
-                        with open(alt_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        # Try to extract the value using the same logic
-                        if "." in source_field:
-                            parts = source_field.split(".")
-                            value = data
-                            for part in parts:
-                                if isinstance(value, dict):
-                                    value = value.get(part)
-                                else:
-                                    break
-                                if value is None:
-                                    break
-                            if value is not None:
-                                return value
-                        else:
-                            value = data.get(source_field)
-                            if value is not None:
-                                return value
-                    except Exception:
-                        continue
+                if self._exists(alt_file):
+                    # Try to extract the value using the same logic
+                    value = _dig(self._load_json(alt_file), field_path)
+                    if value is not None:
+                        return value
         
         return None
     
-    def _calculate_top1_share(self, commits_data: Dict[str, Any]) -> float:
-        """Calculate top 1 author share percentage from commits"""
-        if not commits_data or "recent_commits" not in commits_data:
-            return 0.0
+    def _commit_stats(self, commits_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Aggregate commits.json in a single pass (memoized for the last payload)
         
-        commits = commits_data.get("recent_commits", [])
-        if not commits:
-            return 0.0
+        Returns top1_share (percent of commits by the top author), active_maintainers_90d,
+        commits_30d and feature_commits (among the 20 most recent commits).
+        
+        Evidence packs list commits newest first: while the dates seen so far are in that
+        order, date parsing stops at the first commit older than 90 days.
+        """
+        if self._commit_stats_cache is not None and self._commit_stats_cache[0] is commits_data:
+            return self._commit_stats_cache[1]
+        
+        commits = commits_data.get("recent_commits", []) if commits_data else []
+        if self._now is None:
+            # Called outside calculate_scores
+            self._set_now(datetime.now(timezone.utc))
+        days_30_ago = self._t30
+        days_90_ago = self._t90
         
-        # Count commits by author
         author_counts = {}
-        for commit in commits:
+        active_authors = set()
+        commits_30d = 0
+        feature_commits = 0
+        scan_dates = True
+        previous_date = None
+        newest_first = True
+        for index, commit in enumerate(commits):
             author = commit.get("author", {})
             author_email = author.get("email", "unknown")
             author_counts[author_email] = author_counts.get(author_email, 0) + 1
-        
-        if not author_counts:
+            
+            # Commits without a parseable date only count towards authorship
+            commit_date = _parse_commit_date(commit.get("date", "")) if scan_dates else None
+            if commit_date is not None:
+                if commit_date >= days_90_ago:
+                    active_authors.add(author_email)
+                    if commit_date >= days_30_ago:
+                        commits_30d += 1
+                elif newest_first and previous_date is not None and commit_date <= previous_date:
+                    # Sorted so far (and at least two dates seen): the rest is older still
+                    scan_dates = False
+                if previous_date is not None and commit_date > previous_date:
+                    newest_first = False
+                previous_date = commit_date
+            
+            if index < 20 and _FEATURE_RE.search(commit.get("message", "")):
+                feature_commits += 1
+        
+        stats = {
+            "top1_share": (max(author_counts.values()) / len(commits)) * 100.0 if commits else 0.0,
+            "active_maintainers_90d": len(active_authors),
+            "commits_30d": commits_30d,
+            "feature_commits": feature_commits,
+        }
+        self._commit_stats_cache = (commits_data, stats)
+        return stats
+    
+    def _calculate_top1_share(self, commits_data: Dict[str, Any]) -> float:
+        """Calculate top 1 author share percentage from commits"""
+        if not commits_data or "recent_commits" not in commits_data:
             return 0.0
-        
-        # Get top author
-        total_commits = len(commits)
-        max_commits = max(author_counts.values())
-        
-        # Calculate percentage
-        top1_share = (max_commits / total_commits) * 100.0
-        
-        return top1_share
+        return self._commit_stats(commits_data)["top1_share"]
     
     def _calculate_active_maintainers(self, commits_data: Dict[str, Any]) -> int:
         """Calculate active maintainers in last 90 days"""
         if not commits_data or "recent_commits" not in commits_data:
             return 0
-        
-        from datetime import datetime, timedelta, timezone
-        
-        commits = commits_data.get("recent_commits", [])
-        if not commits:
-            return 0
-        
-        # Get date 90 days ago
-        now = datetime.now(timezone.utc)
-        days_90_ago = now - timedelta(days=90)
-        
-        # Count unique authors in last 90 days
-        active_authors = set()
-        for commit in commits:
-            commit_date_str = commit.get("date", "")
-            if not commit_date_str:
-                continue
-            
-            try:
-                # Try to parse date (handle various formats)
-                commit_date = datetime.fromisoformat(commit_date_str.replace('Z', '+00:00'))
-                if commit_date.tzinfo is None:
-                    # Assume UTC if no timezone
-                    commit_date = commit_date.replace(tzinfo=timezone.utc)
-                
-                if commit_date >= days_90_ago:
-                    author = commit.get("author", {})
-                    author_email = author.get("email", "unknown")
-                    active_authors.add(author_email)
-            except Exception:
-                continue
-        
-        return len(active_authors)
+        return self._commit_stats(commits_data)["active_maintainers_90d"]
     
     def _normalize_value(self, value: Any, normalization: Dict[str, Any]) -> float:
         """Normalize a metric value to a score (0-100)"""
@@ -641,13 +743,6 @@ class ScoringSystem:
     
     def _normalize_thresholds(self, value: float, normalization: Dict[str, Any]) -> float:
         """Normalize using threshold-based scoring"""
-        thresholds = normalization.get("thresholds", [])
-        direction = normalization.get("direction", "higher_is_better")
-        interpolate = normalization.get("interpolate_between_points", False)
-        
-        if not thresholds:
-            return 0.0
-        
         # Handle boolean values
         if isinstance(value, bool):
             value = 1.0 if value else 0.0
@@ -658,50 +753,76 @@ class ScoringSystem:
         except (ValueError, TypeError):
             return 0.0
         
-        # Separate thresholds by type (lte vs gte)
-        lte_thresholds = [t for t in thresholds if "lte" in t]
-        gte_thresholds = [t for t in thresholds if "gte" in t]
+        return self._threshold_scorer(normalization)(value)
+    
+    def _threshold_scorer(self, normalization: Dict[str, Any]) -> Callable[[float], float]:
+        """Scoring function for a thresholds normalization, built once from its presorted tables"""
+        cached = self._threshold_scorers.get(id(normalization))
+        if cached is not None and cached[0] is normalization:
+            return cached[1]
+        
+        thresholds = normalization.get("thresholds", [])
+        direction = normalization.get("direction", "higher_is_better")
+        interpolate = normalization.get("interpolate_between_points", False)
+        lte_thresholds = sorted((t for t in thresholds if "lte" in t), key=lambda x: x.get("lte", 0))
+        gte_thresholds = sorted((t for t in thresholds if "gte" in t),
+                                key=lambda x: x.get("gte", 0), reverse=True)
         
-        # Handle "lte" (lower than or equal) thresholds (for lower_is_better)
         if lte_thresholds and direction == "lower_is_better":
-            sorted_thresholds = sorted(lte_thresholds, key=lambda x: x.get("lte", 0))
-            for i, threshold in enumerate(sorted_thresholds):
-                threshold_value = threshold.get("lte", 0)
-                threshold_score = threshold.get("score", 0)
-                if value <= threshold_value:
-                    if interpolate and i > 0:
-                        # Interpolate between previous and current
-                        prev_threshold = sorted_thresholds[i-1]
-                        prev_value = prev_threshold.get("lte", 0)
-                        prev_score = prev_threshold.get("score", 0)
-                        if threshold_value != prev_value:
-                            ratio = (value - prev_value) / (threshold_value - prev_value)
-                            return prev_score + (threshold_score - prev_score) * ratio
-                    return threshold_score
+            scorer = partial(
+                self._score_lte,
+                tuple(t.get("lte", 0) for t in lte_thresholds),
+                tuple(t.get("score", 0) for t in lte_thresholds),
+                interpolate,
+            )
+        elif gte_thresholds and direction == "higher_is_better":
+            # gte thresholds are kept highest first; bisect runs over the negated values
+            gte_values = tuple(t.get("gte", 0) for t in gte_thresholds)
+            scorer = partial(
+                self._score_gte,
+                gte_values,
+                tuple(-v for v in gte_values),
+                tuple(t.get("score", 0) for t in gte_thresholds),
+                interpolate,
+            )
+        else:
+            scorer = partial(self._score_mixed, thresholds)
+        
+        # Holding the dict keeps its id from being reused by another normalization
+        self._threshold_scorers[id(normalization)] = (normalization, scorer)
+        return scorer
+    
+    @staticmethod
+    def _score_lte(values: tuple, scores: tuple, interpolate: bool, value: float) -> float:
+        """Score "lte" (lower than or equal) thresholds, for lower_is_better"""
+        # First (lowest) threshold the value is below; NaN matches none
+        i = bisect_left(values, value) if value == value else len(values)
+        if i == len(values):
             # Value is greater than all thresholds, use last score
-            return sorted_thresholds[-1].get("score", 0) if sorted_thresholds else 0.0
-        
-        # Handle "gte" (greater than or equal) thresholds (for higher_is_better)
-        if gte_thresholds and direction == "higher_is_better":
-            sorted_thresholds = sorted(gte_thresholds, key=lambda x: x.get("gte", 0), reverse=True)
-            for i, threshold in enumerate(sorted_thresholds):
-                threshold_value = threshold.get("gte", 0)
-                threshold_score = threshold.get("score", 0)
-                if value >= threshold_value:
-                    if interpolate and i > 0:
-                        # Interpolate between current and next (higher)
-                        next_threshold = sorted_thresholds[i-1] if i > 0 else None
-                        if next_threshold:
-                            next_value = next_threshold.get("gte", 0)
-                            next_score = next_threshold.get("score", 0)
-                            if next_value != threshold_value:
-                                ratio = (value - threshold_value) / (next_value - threshold_value)
-                                return threshold_score + (next_score - threshold_score) * ratio
-                    return threshold_score
+            return scores[-1]
+        if interpolate and i > 0 and values[i] != values[i - 1]:
+            # Interpolate between previous and current
+            ratio = (value - values[i - 1]) / (values[i] - values[i - 1])
+            return scores[i - 1] + (scores[i] - scores[i - 1]) * ratio
+        return scores[i]
+    
+    @staticmethod
+    def _score_gte(values: tuple, keys: tuple, scores: tuple, interpolate: bool, value: float) -> float:
+        """Score "gte" (greater than or equal) thresholds, for higher_is_better"""
+        # First (highest) threshold the value reaches; NaN matches none
+        i = bisect_left(keys, -value) if value == value else len(values)
+        if i == len(values):
             # Value is less than all thresholds, use last score
-            return sorted_thresholds[-1].get("score", 0) if sorted_thresholds else 0.0
-        
-        # Mixed thresholds (both lte and gte)
+            return scores[-1]
+        if interpolate and i > 0 and values[i - 1] != values[i]:
+            # Interpolate between current and next (higher)
+            ratio = (value - values[i]) / (values[i - 1] - values[i])
+            return scores[i] + (scores[i - 1] - scores[i]) * ratio
+        return scores[i]
+    
+    @staticmethod
+    def _score_mixed(thresholds: List[Dict[str, Any]], value: float) -> float:
+        """Score mixed thresholds (both lte and gte, or not matching the direction)"""
         # Find the matching threshold
         best_match = None
         for threshold in thresholds:
@@ -755,26 +876,18 @@ class ScoringSystem:
     
     def _score_to_grade(self, score: float) -> str:
         """Convert numeric score to letter grade"""
-        if score >= 90:
-            return "A"
-        elif score >= 80:
-            return "B"
-        elif score >= 70:
-            return "C"
-        elif score >= 60:
-            return "D"
-        else:
+        if score != score:
+            # NaN reaches no bound
             return "E"
+        return _GRADES[bisect_right(_GRADE_BOUNDS, score)]
     
     def _generate_notes(self, scores: Dict[str, float], final_score: float) -> List[str]:
         """Generate notes about the scores"""
         notes = []
         
-        # Find lowest scoring dimensions
-        sorted_dims = sorted(scores.items(), key=lambda x: x[1])
-        
-        if sorted_dims:
-            lowest_dim, lowest_score = sorted_dims[0]
+        # Find lowest scoring dimension (the first one on ties)
+        if scores:
+            lowest_dim, lowest_score = min(scores.items(), key=_BY_VALUE)
             if lowest_score < 50:
                 notes.append(f"Lowest scoring dimension: {lowest_dim} ({lowest_score:.1f}/100). Needs improvement.")
         
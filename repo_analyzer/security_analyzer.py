@@ -1,45 +1,247 @@
 """Security analysis module for code and dependency vulnerability scanning"""
 
+import hashlib
 import json
 import subprocess
 import os
+import shutil
+import stat
 import sys
 import logging
+import threading
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, NamedTuple, Optional
 from datetime import datetime, timezone
-import requests
+
+from . import json_utils
+from .cache_manager import CacheManager
+from .metrics_collector import MetricsCollector
+from .process_utils import run_spooled
+from .repo_facts import RepoFactsCollector
+
+logger = logging.getLogger(__name__)
+
+
+def _with_casings(mapping: Dict[str, str]) -> Dict[str, str]:
+    """mapping plus the UPPER and Title case spellings of its keys"""
+    return {
+        variant: target
+        for key, target in mapping.items()
+        for variant in (key, key.upper(), key.capitalize())
+    }
+
+
+# Severity buckets of the summary, and the scanner spellings folded into them
+_SUMMARY_SEVERITIES = ("critical", "high", "medium", "low", "info")
+_SEVERITY_BUCKETS = _with_casings({
+    "critical": "critical", "high": "high", "medium": "medium", "moderate": "medium",
+    "low": "low", "info": "info",
+})
+
+# Snyk levels mapped to standard severities; other values are just lowercased
+_SNYK_SEVERITIES = _with_casings({
+    "error": "high", "warning": "medium", "note": "low",
+    "critical": "critical", "high": "high", "medium": "medium", "low": "low", "info": "info",
+})
+
+# Shared stand-in for missing SARIF objects (read-only, never put into results)
+_EMPTY = MappingProxyType({})
+
+# Severities npm audit reports for real advisories
+_NPM_SEVERITIES = frozenset({"critical", "high", "moderate", "low", "info"})
+
+# CVSS lower bounds of each severity above "info", in ascending order
+_CVSS_BOUNDS = (0.1, 4.0, 7.0, 9.0)
+_CVSS_SEVERITIES = ("info", "low", "medium", "high", "critical")
+
+
+def _preview(output: Optional[bytes], limit: int = 500, empty: str = 'None') -> str:
+    """First characters of a scanner's raw output, for debug logs"""
+    return output[:limit].decode('utf-8', 'replace') if output else empty
+
+
+class DependencyScanner(NamedTuple):
+    """A dependency audit CLI: how to run it and which methods gate and parse it"""
+    name: str
+    command: str
+    args: tuple
+    guard: str  # method name: does the repo have anything for this scanner to audit
+    parser: str  # method name: decoded JSON report -> vulnerabilities
+    lockfiles: tuple = ()  # their contents key a cached result; empty disables caching
+    timeout: int = 300
 
 
 class SecurityAnalyzer:
     """Analyzes security vulnerabilities in source code using SAST (Static Application Security Testing)"""
     
-    def __init__(self, repo_path: str, snyk_token: Optional[str] = None, verbose: bool = False):
+    # SAST scanners in priority order: (scanner name, log label, method name)
+    SAST_SCANNERS = (
+        ("snyk-code", "Snyk Code", "_run_snyk_code_test"),
+        ("sonarqube", "SonarQube", "_run_sonarqube"),
+        ("codeql", "CodeQL", "_run_codeql"),
+    )
+    
+    # Dependency audit CLIs by scanner name. npm audit reads the first lockfile found;
+    # safety and pip-audit audit the installed environment, so no lockfile keys them
+    DEPENDENCY_SCANNERS = {
+        "npm-audit": DependencyScanner(
+            "npm audit", "npm", ("audit", "--json"), "_has_package_json", "_parse_npm_audit",
+            lockfiles=("npm-shrinkwrap.json", "package-lock.json"),
+        ),
+        "safety": DependencyScanner(
+            "safety", "safety", ("check", "--json"), "_has_python_manifest", "_parse_safety",
+        ),
+        "pip-audit": DependencyScanner(
+            "pip-audit", "pip-audit", ("--format=json",), "_has_python_manifest", "_parse_pip_audit",
+        ),
+    }
+    
+    # Any of these marks a Python project worth auditing with safety/pip-audit
+    PYTHON_MANIFESTS = ("requirements.txt", "pyproject.toml", "Pipfile", "setup.py")
+    
+    def __init__(self, repo_path: str, snyk_token: Optional[str] = None, verbose: bool = False,
+                 use_cache: bool = True):
         self.repo_path = Path(repo_path)
         self.snyk_token = snyk_token or os.environ.get('SNYK_TOKEN')
+        # Environment for snyk runs: the process environment plus the token, built once
+        self._snyk_env = {**os.environ, 'SNYK_TOKEN': self.snyk_token} if self.snyk_token else None
         self.verbose = verbose
         self.debug_logs = []
+        # Scanners log from worker threads: keep each message and its echo together
+        self._debug_lock = threading.Lock()
+        self.cache_manager = None
+        if use_cache:
+            try:
+                self.cache_manager = CacheManager()
+            except OSError:
+                # Cache directory not writable, continue without cache
+                self.cache_manager = None
+        # Resolved scanner CLI paths by command name (None when not installed)
+        self._cli_paths: Dict[str, Optional[str]] = {}
         
-        # Setup logging
-        self.logger = logging.getLogger(__name__)
-        if not self.logger.handlers:
-            handler = logging.StreamHandler(sys.stderr)
-            handler.setLevel(logging.DEBUG if verbose else logging.INFO)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+        # Handlers and levels are left to the application; verbosity is per instance (_debug)
+        self.logger = logger
     
     def _debug(self, message: str):
         """Log debug message"""
-        self.debug_logs.append(message)
-        if self.verbose:
-            self.logger.debug(message)
-            print(f"[DEBUG Security] {message}", file=sys.stderr, flush=True)
+        with self._debug_lock:
+            self.debug_logs.append(message)
+            if self.verbose:
+                self.logger.debug(message)
+                print(f"[DEBUG Security] {message}", file=sys.stderr, flush=True)
+    
+    def _which(self, command: str) -> Optional[str]:
+        """Path of a CLI on PATH, looked up once per analyzer"""
+        if command not in self._cli_paths:
+            self._cli_paths[command] = shutil.which(command)
+        return self._cli_paths[command]
+    
+    @staticmethod
+    def _finding_key(vuln: Dict[str, Any]) -> tuple:
+        """What, where and how severe a finding is, to spot the same finding reported twice"""
+        file_path = vuln.get("file")
+        line = vuln.get("line")
+        location = vuln.get("location")
+        if isinstance(location, dict):
+            # CodeQL keeps the SARIF physicalLocation as is
+            file_path = file_path or location.get("artifactLocation", {}).get("uri")
+            line = line or location.get("region", {}).get("startLine")
+        return (
+            vuln.get("package") or vuln.get("rule_id"),
+            vuln.get("cve") or vuln.get("title") or vuln.get("message"),
+            vuln.get("severity"),
+            file_path,
+            line,
+        )
+    
+    @cached_property
+    def _root_entries(self) -> frozenset:
+        """Names in the repository root, listed once per analysis for the report probes"""
+        try:
+            with os.scandir(self.repo_path) as entries:
+                return frozenset(entry.name for entry in entries)
+        except OSError:
+            return frozenset()
+    
+    def _report_stat(self, path: Path) -> Optional[os.stat_result]:
+        """stat of a report path under the repo, or None if it does not exist"""
+        # Reports under a top-level entry that is not there need no stat at all
+        if path.relative_to(self.repo_path).parts[0] not in self._root_entries:
+            return None
+        try:
+            return path.stat()
+        except OSError:
+            return None
+    
+    def _has_package_json(self) -> bool:
+        """Check if the repo declares Node.js dependencies"""
+        return (self.repo_path / "package.json").exists()
+    
+    def _has_python_manifest(self) -> bool:
+        """Check if the repo declares Python dependencies"""
+        return any((self.repo_path / name).exists() for name in self.PYTHON_MANIFESTS)
+    
+    def _lockfile_cache_key(self, scanner: str, lockfiles: tuple) -> Optional[str]:
+        """Cache key from the contents of the first lockfile found (None without cache or lockfile)"""
+        if not self.cache_manager:
+            return None
+        for name in lockfiles:
+            try:
+                data = (self.repo_path / name).read_bytes()
+            except OSError:
+                continue
+            return self.cache_manager.get_cache_key(scanner, {
+                "lockfile": name,
+                "digest": hashlib.blake2b(data, digest_size=16).hexdigest(),
+            })
+        return None
+    
+    def _code_scan_cache_key(self, scanner: str, tool_path: str) -> Optional[str]:
+        """Cache key for a code scan of the current tree, .snyk policy, account and scanner install.
+        
+        None without cache, or when the scanner is not an installed binary.
+        """
+        if not self.cache_manager:
+            return None
+        try:
+            # An upgraded scanner binary gets a new mtime, and so a new key
+            tool_stamp = os.stat(tool_path).st_mtime_ns
+        except OSError:
+            # No installed binary to stamp (e.g. 'npx' fetching the latest snyk): an
+            # upgrade could not be detected, so don't cache
+            return None
+        
+        # The .snyk policy (ignores) changes findings without touching any code file
+        try:
+            policy = hashlib.blake2b((self.repo_path / ".snyk").read_bytes(), digest_size=16).hexdigest()
+        except OSError:
+            policy = None
+        
+        # Findings depend on the account/org: key on a fingerprint, never the raw token
+        token = self.snyk_token
+        token_fingerprint = hashlib.blake2b(token.encode(), digest_size=8).hexdigest() if token else None
+        
+        return self.cache_manager.get_cache_key(scanner, {
+            "repo_path": str(self.repo_path.resolve()),
+            "commit_sha": RepoFactsCollector(str(self.repo_path)).collect()["commit_sha"],
+            "signature": MetricsCollector(str(self.repo_path), use_cache=False).signature(),
+            "tool": tool_path,
+            "tool_stamp": tool_stamp,
+            "policy": policy,
+            "token": token_fingerprint,
+            "org": os.environ.get("SNYK_CFG_ORG"),
+        })
     
     def analyze(self, deps_info: Dict[str, Any], stack_info: Dict[str, Any]) -> Dict[str, Any]:
         """Perform code security analysis (SAST only, no dependency scanning)"""
         self._debug(f"Starting security analysis for repo: {self.repo_path}")
+        # Reports may have been produced since the last run: list the root again
+        self.__dict__.pop("_root_entries", None)
         
         result = {
             "scan_timestamp": datetime.now(timezone.utc).isoformat(),
@@ -63,60 +265,52 @@ class SecurityAnalyzer:
         self._debug("Running code security analysis (SAST) only - skipping dependency scanners")
         
         # Only run code security scanners (SAST), not dependency scanners
-        # Try Snyk Code (code analysis) if available and token provided
         # Snyk Code works with multiple languages, so run it regardless of package manager
-        if self.snyk_token:
-            self._debug("Snyk token available, trying Snyk Code scanner...")
-            try:
-                snyk_result = self._run_snyk_code_test()
-                if snyk_result:
-                    vuln_count = len(snyk_result.get("vulnerabilities", []))
-                    self._debug(f"Snyk Code found {vuln_count} vulnerabilities")
-                    if "error" in snyk_result:
-                        self._debug(f"Snyk Code error: {snyk_result['error']}")
-                    result["vulnerabilities"].extend(snyk_result.get("vulnerabilities", []))
-                    result["summary"] = self._calculate_summary(result["vulnerabilities"])
-                    result["scanners_used"].append("snyk-code")
-                    if not result["scan_method"]:
-                        result["scan_method"] = "snyk-code"
-                else:
-                    self._debug("Snyk Code returned no results")
-            except Exception as e:
-                self._debug(f"Snyk Code failed with error: {str(e)}")
-        else:
+        scanners = list(self.SAST_SCANNERS)
+        if not self.snyk_token:
             self._debug("Snyk token not available, skipping Snyk Code")
+            scanners = [s for s in scanners if s[0] != "snyk-code"]
         
-        # Try SonarQube if configured
-        self._debug("Checking for SonarQube...")
-        try:
-            sonar_result = self._run_sonarqube()
-            if sonar_result:
-                self._debug(f"SonarQube found results")
-                result["vulnerabilities"].extend(sonar_result.get("vulnerabilities", []))
-                result["summary"] = self._calculate_summary(result["vulnerabilities"])
-                result["scanners_used"].append("sonarqube")
-                if not result["scan_method"]:
-                    result["scan_method"] = "sonarqube"
-            else:
-                self._debug("SonarQube not found")
-        except Exception as e:
-            self._debug(f"SonarQube check failed with error: {str(e)}")
+        # The scanners are independent subprocess/file reads: run them side by side
+        with ThreadPoolExecutor(max_workers=len(scanners)) as executor:
+            futures = [
+                (name, label, executor.submit(getattr(self, method)))
+                for name, label, method in scanners
+            ]
         
-        # Try CodeQL if available
-        self._debug("Checking for CodeQL...")
-        try:
-            codeql_result = self._run_codeql()
-            if codeql_result:
-                self._debug(f"CodeQL found {len(codeql_result.get('vulnerabilities', []))} vulnerabilities")
-                result["vulnerabilities"].extend(codeql_result.get("vulnerabilities", []))
-                result["summary"] = self._calculate_summary(result["vulnerabilities"])
-                result["scanners_used"].append("codeql")
-                if not result["scan_method"]:
-                    result["scan_method"] = "codeql"
-            else:
-                self._debug("CodeQL not found")
-        except Exception as e:
-            self._debug(f"CodeQL check failed with error: {str(e)}")
+        # Merge in priority order so results and scan_method don't depend on completion order
+        seen = set()
+        duplicates = 0
+        for name, label, future in futures:
+            try:
+                scanner_result = future.result()
+            except Exception as e:
+                self._debug(f"{label} failed with error: {str(e)}")
+                continue
+            if not scanner_result:
+                self._debug(f"{label} returned no results")
+                continue
+            
+            vulnerabilities = scanner_result.get("vulnerabilities", [])
+            self._debug(f"{label} found {len(vulnerabilities)} vulnerabilities")
+            if "error" in scanner_result:
+                self._debug(f"{label} error: {scanner_result['error']}")
+            # The same finding reported twice (by one scanner or several) is kept once
+            for vuln in vulnerabilities:
+                key = self._finding_key(vuln)
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                result["vulnerabilities"].append(vuln)
+            result["scanners_used"].append(name)
+            if not result["scan_method"]:
+                result["scan_method"] = name
+        
+        result["summary"] = self._calculate_summary(result["vulnerabilities"])
+        result["summary"]["duplicates_removed"] = duplicates
+        if duplicates:
+            self._debug(f"Dropped {duplicates} duplicate findings")
         
         # If no scanners found, mark as not scanned
         if not result["scanners_used"]:
@@ -124,74 +318,136 @@ class SecurityAnalyzer:
             result["scan_method"] = "none"
             result["note"] = "No code security scanners (SAST) available. Install and configure Snyk Code (requires SNYK_TOKEN), SonarQube, or CodeQL."
         
-        result["summary"]["total"] = len(result["vulnerabilities"])
         result["debug_logs"] = self.debug_logs
         self._debug(f"Security analysis complete. Total vulnerabilities: {result['summary']['total']}")
         
         return result
     
-    def _run_npm_audit(self) -> Optional[Dict[str, Any]]:
-        """Run npm audit for Node.js dependencies"""
-        package_json = self.repo_path / "package.json"
-        self._debug(f"Checking for package.json at: {package_json}")
-        if not package_json.exists():
-            self._debug("package.json not found, skipping npm audit")
+    def _run_dependency_scanner(self, spec: DependencyScanner) -> Optional[Dict[str, Any]]:
+        """Run a dependency audit CLI and parse its JSON report"""
+        if not getattr(self, spec.guard)():
+            self._debug(f"No dependency manifest found, skipping {spec.name}")
             return None
+        tool_path = self._which(spec.command)
+        if not tool_path:
+            self._debug(f"{spec.command} command not found")
+            return None
+        
+        # Unchanged lockfile: reuse the last audit (the cache expires, so advisories refresh)
+        cache_key = None
+        if spec.lockfiles:
+            cache_key = self._lockfile_cache_key(spec.name.replace(" ", "_"), spec.lockfiles)
+        if cache_key:
+            cached = self.cache_manager.get(cache_key)
+            if cached:
+                try:
+                    scan_result = json_utils.loads(cached)
+                    self._debug(f"Using cached {spec.name} result")
+                    return scan_result
+                except ValueError:
+                    pass
         
         try:
-            self._debug("Running npm audit command...")
-            # Try npm audit --json
-            result = subprocess.run(
-                ['npm', 'audit', '--json'],
-                capture_output=True,
-                text=True,
-                timeout=300,
-                cwd=str(self.repo_path)
-            )
-            
-            self._debug(f"npm audit exit code: {result.returncode}")
-            
-            if result.returncode == 0 or result.returncode == 1:  # Exit code 1 means vulnerabilities found
-                self._debug("Parsing npm audit JSON output...")
-                audit_data = json.loads(result.stdout)
+            self._debug(f"Running {spec.name}...")
+            with run_spooled([tool_path, *spec.args], timeout=spec.timeout, cwd=str(self.repo_path)) as result:
+                self._debug(f"{spec.name} exit code: {result.returncode}")
                 
-                vulnerabilities = []
-                if "vulnerabilities" in audit_data:
-                    self._debug(f"Found {len(audit_data['vulnerabilities'])} vulnerability entries in npm audit output")
-                    for pkg_name, vuln_info in audit_data["vulnerabilities"].items():
-                        if isinstance(vuln_info, dict):
-                            severity = vuln_info.get("severity", "unknown").lower()
-                            if severity in ["critical", "high", "moderate", "low", "info"]:
-                                vulnerabilities.append({
-                                    "package": pkg_name,
-                                    "severity": severity,
-                                    "title": vuln_info.get("title", ""),
-                                    "url": vuln_info.get("url", ""),
-                                    "dependency_of": vuln_info.get("via", []),
-                                    "vulnerable_versions": vuln_info.get("vulnerableVersions", ""),
-                                    "patched_versions": vuln_info.get("patchedVersions", ""),
-                                    "scanner": "npm-audit",
-                                })
+                if result.returncode == 0 or result.returncode == 1:  # Exit code 1 means vulnerabilities found
+                    self._debug(f"Parsing {spec.name} JSON output...")
+                    try:
+                        report = json_utils.loads(result.stdout)
+                    except json.JSONDecodeError as e:
+                        self._debug(f"Failed to parse {spec.name} JSON: {str(e)}")
+                        self._debug(f"{spec.name} stdout (first 500 chars): {_preview(result.stdout)}")
+                        return None
                 else:
-                    self._debug("No 'vulnerabilities' key in npm audit output")
-                
-                self._debug(f"npm audit found {len(vulnerabilities)} vulnerabilities")
-                return {"vulnerabilities": vulnerabilities}
-            else:
-                self._debug(f"npm audit failed with exit code {result.returncode}")
-                self._debug(f"npm audit stderr: {result.stderr[:500] if result.stderr else 'None'}")
+                    self._debug(f"{spec.name} failed with exit code {result.returncode}")
+                    self._debug(f"{spec.name} stderr: {_preview(result.stderr)}")
+                    return None
+            
+            vulnerabilities = getattr(self, spec.parser)(report)
+            self._debug(f"{spec.name} found {len(vulnerabilities)} vulnerabilities")
+            scan_result = {"vulnerabilities": vulnerabilities}
+            if cache_key:
+                self.cache_manager.set(cache_key, json.dumps(scan_result))
+            return scan_result
         except FileNotFoundError:
-            self._debug("npm command not found")
+            self._debug(f"{spec.command} command not found")
         except subprocess.TimeoutExpired:
-            self._debug("npm audit timed out after 300 seconds")
-        except json.JSONDecodeError as e:
-            self._debug(f"Failed to parse npm audit JSON: {str(e)}")
-            self._debug(f"npm audit stdout (first 500 chars): {result.stdout[:500] if 'result' in locals() else 'N/A'}")
+            self._debug(f"{spec.name} timed out after {spec.timeout} seconds")
         except Exception as e:
-            self._debug(f"npm audit failed with exception: {type(e).__name__}: {str(e)}")
+            self._debug(f"{spec.name} failed with exception: {type(e).__name__}: {str(e)}")
         
         return None
     
+    def _run_npm_audit(self) -> Optional[Dict[str, Any]]:
+        """Run npm audit for Node.js dependencies"""
+        return self._run_dependency_scanner(self.DEPENDENCY_SCANNERS["npm-audit"])
+    
+    def _run_safety_check(self) -> Optional[Dict[str, Any]]:
+        """Run safety check for Python dependencies"""
+        return self._run_dependency_scanner(self.DEPENDENCY_SCANNERS["safety"])
+    
+    def _run_pip_audit(self) -> Optional[Dict[str, Any]]:
+        """Run pip-audit for Python dependencies"""
+        return self._run_dependency_scanner(self.DEPENDENCY_SCANNERS["pip-audit"])
+    
+    def _parse_npm_audit(self, audit_data: Any) -> List[Dict[str, Any]]:
+        """Vulnerabilities from an npm audit JSON report"""
+        vulnerabilities = []
+        if "vulnerabilities" in audit_data:
+            self._debug(f"Found {len(audit_data['vulnerabilities'])} vulnerability entries in npm audit output")
+            for pkg_name, vuln_info in audit_data["vulnerabilities"].items():
+                if isinstance(vuln_info, dict):
+                    severity = vuln_info.get("severity", "unknown").lower()
+                    if severity in _NPM_SEVERITIES:
+                        vulnerabilities.append({
+                            "package": pkg_name,
+                            "severity": severity,
+                            "title": vuln_info.get("title", ""),
+                            "url": vuln_info.get("url", ""),
+                            "dependency_of": vuln_info.get("via", []),
+                            "vulnerable_versions": vuln_info.get("vulnerableVersions", ""),
+                            "patched_versions": vuln_info.get("patchedVersions", ""),
+                            "scanner": "npm-audit",
+                        })
+        else:
+            self._debug("No 'vulnerabilities' key in npm audit output")
+        return vulnerabilities
+    
+    def _parse_safety(self, safety_data: Any) -> List[Dict[str, Any]]:
+        """Vulnerabilities from a safety check JSON report"""
+        vulnerabilities = []
+        if isinstance(safety_data, list):
+            for vuln in safety_data:
+                vulnerabilities.append({
+                    "package": vuln.get("package", ""),
+                    "installed_version": vuln.get("installed_version", ""),
+                    "vulnerable_spec": vuln.get("vulnerable_spec", ""),
+                    "severity": self._map_safety_severity(vuln.get("advisory", "")),
+                    "advisory": vuln.get("advisory", ""),
+                    "scanner": "safety",
+                })
+        return vulnerabilities
+    
+    def _parse_pip_audit(self, audit_data: Any) -> List[Dict[str, Any]]:
+        """Vulnerabilities from a pip-audit JSON report"""
+        vulnerabilities = []
+        if "vulnerabilities" in audit_data:
+            for vuln in audit_data["vulnerabilities"]:
+                vulnerabilities.append({
+                    "package": vuln.get("name", ""),
+                    "installed_version": vuln.get("installed_version", ""),
+                    "vulnerable_spec": vuln.get("vulnerable_spec", ""),
+                    "severity": self._map_cvss_severity(vuln.get("cvss", {}).get("score", 0)),
+                    "cve": vuln.get("id", ""),
+                    "cvss_score": vuln.get("cvss", {}).get("score", 0),
+                    "scanner": "pip-audit",
+                })
+        else:
+            self._debug("No 'vulnerabilities' key in pip-audit output")
+        return vulnerabilities
+    
     def _run_snyk_code_test(self) -> Optional[Dict[str, Any]]:
         """Run Snyk Code test (SAST - Static Application Security Testing) on source code"""
         if not self.snyk_token:
@@ -200,13 +456,9 @@ class SecurityAnalyzer:
         
         try:
             self._debug("Starting Snyk Code test...")
-            # Set Snyk token as environment variable
-            env = os.environ.copy()
-            env['SNYK_TOKEN'] = self.snyk_token
             
             # Quick check if snyk is available before running (fast fail)
-            import shutil
-            snyk_path = shutil.which('snyk')
+            snyk_path = self._which('snyk')
             
             # If snyk not found, try to install it automatically
             if not snyk_path:
@@ -214,10 +466,11 @@ class SecurityAnalyzer:
                 installed = self._install_snyk()
                 if installed:
                     # Try to find it again after installation
-                    snyk_path = shutil.which('snyk')
+                    self._cli_paths.pop('snyk', None)
+                    snyk_path = self._which('snyk')
                     if not snyk_path:
                         # Check if it was installed locally (npx or node_modules/.bin)
-                        npx_snyk = shutil.which('npx')
+                        npx_snyk = self._which('npx')
                         if npx_snyk:
                             snyk_path = 'npx'  # Use npx to run snyk
                             self._debug("Using npx to run snyk")
@@ -228,6 +481,18 @@ class SecurityAnalyzer:
                     self._debug("Failed to install snyk, skipping Snyk Code scan")
                     return None
             
+            # Unchanged code and snyk install: reuse the last scan (entries expire with the cache)
+            cache_key = self._code_scan_cache_key("snyk_code", snyk_path)
+            if cache_key:
+                cached = self.cache_manager.get(cache_key)
+                if cached:
+                    try:
+                        scan_result = json_utils.loads(cached)
+                        self._debug("Using cached Snyk Code result")
+                        return scan_result
+                    except ValueError:
+                        pass
+            
             # Run Snyk Code test directly - simple and fast
             # Snyk Code supports: JavaScript, TypeScript, Python, Java, C#, Go, PHP, Ruby, etc.
             self._debug(f"Running snyk code test in directory: {self.repo_path}")
@@ -239,14 +504,13 @@ class SecurityAnalyzer:
                 else:
                     cmd = [snyk_path, 'code', 'test', '--json']
                 
-                result = subprocess.run(
+                with run_spooled(
                     cmd,
-                    capture_output=True,
-                    text=True,
                     timeout=600,  # Code analysis can take longer
-                    env=env,
-                    cwd=str(self.repo_path)
-                )
+                    cwd=str(self.repo_path),
+                    env=self._snyk_env
+                ) as result:
+                    snyk_data = self._decode_snyk_output(result)
             except FileNotFoundError:
                 self._debug("snyk command not found when trying to execute, skipping")
                 return None
@@ -260,101 +524,42 @@ class SecurityAnalyzer:
                 self._debug(f"Snyk Code test failed: {type(e).__name__}: {str(e)}")
                 return None
             
-            self._debug(f"Snyk Code test completed with exit code: {result.returncode}")
-            self._debug(f"Snyk Code stdout length: {len(result.stdout) if result.stdout else 0}")
-            self._debug(f"Snyk Code stderr length: {len(result.stderr) if result.stderr else 0}")
+            if snyk_data is None:
+                return None
             
-            # Snyk returns exit code 1 when vulnerabilities are found (this is normal)
-            if result.returncode == 0 or result.returncode == 1:
-                self._debug("Parsing Snyk Code JSON output...")
-                try:
-                    snyk_data = json.loads(result.stdout)
-                    self._debug("Successfully parsed JSON from stdout")
-                except json.JSONDecodeError as e:
-                    self._debug(f"Failed to parse JSON from stdout: {str(e)}")
-                    self._debug(f"First 200 chars of stdout: {result.stdout[:200] if result.stdout else 'Empty'}")
-                    # If stdout is not JSON, check stderr for JSON output
-                    try:
-                        self._debug("Trying to parse JSON from stderr...")
-                        snyk_data = json.loads(result.stderr)
-                        self._debug("Successfully parsed JSON from stderr")
-                    except json.JSONDecodeError as e2:
-                        self._debug(f"Failed to parse JSON from stderr: {str(e2)}")
-                        self._debug(f"First 200 chars of stderr: {result.stderr[:200] if result.stderr else 'Empty'}")
-                        return None
-                
-                vulnerabilities = []
-                
-                # Snyk Code JSON format
-                if "runs" in snyk_data:
-                    self._debug("Processing Snyk Code SARIF format...")
-                    runs = snyk_data.get("runs", [])
-                    self._debug(f"Found {len(runs)} runs in Snyk Code output")
-                    # SARIF format (standard for Snyk Code)
-                    for run in runs:
-                        results = run.get("results", [])
-                        self._debug(f"Processing {len(results)} results in run")
-                        for result_item in results:
-                            rule = result_item.get("rule", {})
-                            message = result_item.get("message", {})
-                            location = result_item.get("locations", [{}])[0].get("physicalLocation", {})
-                            
-                            # Extract file path
-                            file_path = ""
-                            if "artifactLocation" in location:
-                                file_path = location["artifactLocation"].get("uri", "")
-                            elif "fileLocation" in location:
-                                file_path = location["fileLocation"].get("uri", "")
-                            
-                            # Extract line number
-                            line_number = None
-                            if "region" in location:
-                                line_number = location["region"].get("startLine")
-                            
-                            # Get severity from rule properties or default
-                            severity = "medium"
-                            if "properties" in rule:
-                                severity = rule["properties"].get("security-severity", "medium")
-                            elif "severity" in rule:
-                                severity = rule["severity"]
-                            
-                            vulnerabilities.append({
-                                "rule_id": rule.get("id", ""),
-                                "severity": self._map_snyk_severity(severity),
-                                "title": rule.get("shortDescription", {}).get("text", ""),
-                                "message": message.get("text", ""),
-                                "file": file_path,
-                                "line": line_number,
-                                "url": rule.get("helpUri", ""),
-                                "scanner": "snyk-code",
-                                "type": "code"  # Indicates this is code analysis, not dependency
-                            })
-                elif "vulnerabilities" in snyk_data:
-                    self._debug("Processing Snyk Code alternative format...")
-                    vulns = snyk_data["vulnerabilities"]
-                    self._debug(f"Found {len(vulns)} vulnerabilities in alternative format")
-                    # Alternative format
-                    for vuln in vulns:
-                        vulnerabilities.append({
-                            "rule_id": vuln.get("id", ""),
-                            "severity": vuln.get("severity", "unknown").lower(),
-                            "title": vuln.get("title", ""),
-                            "message": vuln.get("message", ""),
-                            "file": vuln.get("file", ""),
-                            "line": vuln.get("line"),
-                            "scanner": "snyk-code",
-                            "type": "code"
-                        })
-                else:
-                    self._debug(f"Snyk Code output format not recognized. Keys found: {list(snyk_data.keys())[:10]}")
-                
-                self._debug(f"Snyk Code found {len(vulnerabilities)} vulnerabilities")
-                return {"vulnerabilities": vulnerabilities}
+            vulnerabilities = []
+            
+            # Snyk Code JSON format
+            if "runs" in snyk_data:
+                self._debug("Processing Snyk Code SARIF format...")
+                runs = snyk_data.get("runs", [])
+                self._debug(f"Found {len(runs)} runs in Snyk Code output")
+                # SARIF format (standard for Snyk Code)
+                vulnerabilities = self._parse_snyk_sarif(runs)
+            elif "vulnerabilities" in snyk_data:
+                self._debug("Processing Snyk Code alternative format...")
+                vulns = snyk_data["vulnerabilities"]
+                self._debug(f"Found {len(vulns)} vulnerabilities in alternative format")
+                # Alternative format
+                for vuln in vulns:
+                    vulnerabilities.append({
+                        "rule_id": vuln.get("id", ""),
+                        "severity": vuln.get("severity", "unknown").lower(),
+                        "title": vuln.get("title", ""),
+                        "message": vuln.get("message", ""),
+                        "file": vuln.get("file", ""),
+                        "line": vuln.get("line"),
+                        "scanner": "snyk-code",
+                        "type": "code"
+                    })
             else:
-                # Non-zero exit code that's not 0 or 1
-                self._debug(f"Snyk Code test failed with exit code {result.returncode}")
-                self._debug(f"Snyk Code stderr: {result.stderr[:500] if result.stderr else 'None'}")
-                return None
+                self._debug(f"Snyk Code output format not recognized. Keys found: {list(snyk_data.keys())[:10]}")
+            
+            self._debug(f"Snyk Code found {len(vulnerabilities)} vulnerabilities")
+            scan_result = {"vulnerabilities": vulnerabilities}
+            if cache_key:
+                self.cache_manager.set(cache_key, json.dumps(scan_result))
+            return scan_result
         except Exception as e:
             # Catch any other unexpected errors
             self._debug(f"Snyk Code scan failed with exception: {type(e).__name__}: {str(e)}")
@@ -362,21 +567,110 @@ class SecurityAnalyzer:
         
         return None
     
+    def _decode_snyk_output(self, result: subprocess.CompletedProcess) -> Optional[Any]:
+        """Decoded JSON report of a finished snyk run (None on failure or unparseable output)"""
+        self._debug(f"Snyk Code test completed with exit code: {result.returncode}")
+        self._debug(f"Snyk Code stdout length: {len(result.stdout) if result.stdout else 0}")
+        self._debug(f"Snyk Code stderr length: {len(result.stderr) if result.stderr else 0}")
+        
+        # Snyk returns exit code 1 when vulnerabilities are found (this is normal)
+        if result.returncode != 0 and result.returncode != 1:
+            self._debug(f"Snyk Code test failed with exit code {result.returncode}")
+            self._debug(f"Snyk Code stderr: {_preview(result.stderr)}")
+            return None
+        
+        self._debug("Parsing Snyk Code JSON output...")
+        try:
+            snyk_data = json_utils.loads(result.stdout)
+            self._debug("Successfully parsed JSON from stdout")
+            return snyk_data
+        except json.JSONDecodeError as e:
+            self._debug(f"Failed to parse JSON from stdout: {str(e)}")
+            self._debug(f"First 200 chars of stdout: {_preview(result.stdout, 200, 'Empty')}")
+        
+        # If stdout is not JSON, check stderr for JSON output
+        try:
+            self._debug("Trying to parse JSON from stderr...")
+            snyk_data = json_utils.loads(result.stderr)
+            self._debug("Successfully parsed JSON from stderr")
+            return snyk_data
+        except json.JSONDecodeError as e:
+            self._debug(f"Failed to parse JSON from stderr: {str(e)}")
+            self._debug(f"First 200 chars of stderr: {_preview(result.stderr, 200, 'Empty')}")
+            return None
+    
+    def _snyk_rule_info(self, rule: Dict[str, Any]) -> tuple:
+        """(rule id, title, help URL, severity) of a SARIF rule"""
+        # Get severity from rule properties or default
+        severity = "medium"
+        if "properties" in rule:
+            severity = rule["properties"].get("security-severity", "medium")
+        elif "severity" in rule:
+            severity = rule["severity"]
+        return (
+            rule.get("id", ""),
+            rule.get("shortDescription", {}).get("text", ""),
+            rule.get("helpUri", ""),
+            self._map_snyk_severity(severity),
+        )
+    
+    def _parse_snyk_sarif(self, runs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Findings from Snyk Code SARIF runs
+        
+        Rules declared once under tool.driver.rules are resolved a single time and
+        looked up by each result's ruleId; a rule inlined in the result takes precedence.
+        """
+        vulnerabilities = []
+        for run in runs:
+            results = run.get("results", [])
+            self._debug(f"Processing {len(results)} results in run")
+            rules = {
+                rule["id"]: self._snyk_rule_info(rule)
+                for rule in run.get("tool", {}).get("driver", {}).get("rules", [])
+                if "id" in rule
+            }
+            
+            for result_item in results:
+                rule = result_item.get("rule")
+                if rule is not None:
+                    rule_id, title, url, severity = self._snyk_rule_info(rule)
+                else:
+                    rule_id = result_item.get("ruleId", "")
+                    rule_id, title, url, severity = rules.get(rule_id, (rule_id, "", "", "medium"))
+                locations = result_item.get("locations")
+                location = (locations[0] if locations else _EMPTY).get("physicalLocation") or _EMPTY
+                
+                # Extract file path
+                artifact = location.get("artifactLocation") or location.get("fileLocation")
+                region = location.get("region")
+                
+                vulnerabilities.append({
+                    "rule_id": rule_id,
+                    "severity": severity,
+                    "title": title,
+                    "message": (result_item.get("message") or _EMPTY).get("text", ""),
+                    "file": artifact.get("uri", "") if artifact else "",
+                    "line": region.get("startLine") if region else None,
+                    "url": url,
+                    "scanner": "snyk-code",
+                    "type": "code"  # Indicates this is code analysis, not dependency
+                })
+        return vulnerabilities
+    
     def _install_snyk(self) -> bool:
         """Try to install Snyk CLI if not available"""
         try:
             self._debug("Attempting to install Snyk CLI via npm...")
             
             # Check if npm is available
-            import shutil
-            npm_path = shutil.which('npm')
+            npm_path = self._which('npm')
             if not npm_path:
                 self._debug("npm not found, cannot install snyk")
                 return False
             
             # Try to install snyk globally or locally
             # First try npx (which doesn't require installation)
-            npx_path = shutil.which('npx')
+            npx_path = self._which('npx')
             if npx_path:
                 self._debug("npx available, will use 'npx snyk' instead of installing")
                 return True  # npx can run snyk without installing
@@ -425,109 +719,7 @@ class SecurityAnalyzer:
     
     def _map_snyk_severity(self, severity: str) -> str:
         """Map Snyk severity to standard format"""
-        severity_map = {
-            "error": "high",
-            "warning": "medium",
-            "note": "low",
-        }
-        return severity_map.get(severity.lower(), severity.lower())
-    
-    def _run_safety_check(self) -> Optional[Dict[str, Any]]:
-        """Run safety check for Python dependencies"""
-        try:
-            self._debug("Running safety check...")
-            result = subprocess.run(
-                ['safety', 'check', '--json'],
-                capture_output=True,
-                text=True,
-                timeout=300,
-                cwd=str(self.repo_path)
-            )
-            
-            self._debug(f"safety exit code: {result.returncode}")
-            
-            if result.returncode == 0 or result.returncode == 1:
-                self._debug("Parsing safety JSON output...")
-                safety_data = json.loads(result.stdout)
-                
-                vulnerabilities = []
-                if isinstance(safety_data, list):
-                    self._debug(f"safety found {len(safety_data)} vulnerabilities")
-                    for vuln in safety_data:
-                        vulnerabilities.append({
-                            "package": vuln.get("package", ""),
-                            "installed_version": vuln.get("installed_version", ""),
-                            "vulnerable_spec": vuln.get("vulnerable_spec", ""),
-                            "severity": self._map_safety_severity(vuln.get("advisory", "")),
-                            "advisory": vuln.get("advisory", ""),
-                            "scanner": "safety",
-                        })
-                
-                return {"vulnerabilities": vulnerabilities}
-            else:
-                self._debug(f"safety failed with exit code {result.returncode}")
-                self._debug(f"safety stderr: {result.stderr[:500] if result.stderr else 'None'}")
-        except FileNotFoundError:
-            self._debug("safety command not found")
-        except subprocess.TimeoutExpired:
-            self._debug("safety timed out after 300 seconds")
-        except json.JSONDecodeError as e:
-            self._debug(f"Failed to parse safety JSON: {str(e)}")
-            self._debug(f"safety stdout (first 500 chars): {result.stdout[:500] if 'result' in locals() else 'N/A'}")
-        except Exception as e:
-            self._debug(f"safety failed with exception: {type(e).__name__}: {str(e)}")
-        
-        return None
-    
-    def _run_pip_audit(self) -> Optional[Dict[str, Any]]:
-        """Run pip-audit for Python dependencies"""
-        try:
-            self._debug("Running pip-audit...")
-            result = subprocess.run(
-                ['pip-audit', '--format=json'],
-                capture_output=True,
-                text=True,
-                timeout=300,
-                cwd=str(self.repo_path)
-            )
-            
-            self._debug(f"pip-audit exit code: {result.returncode}")
-            
-            if result.returncode == 0 or result.returncode == 1:
-                self._debug("Parsing pip-audit JSON output...")
-                audit_data = json.loads(result.stdout)
-                
-                vulnerabilities = []
-                if "vulnerabilities" in audit_data:
-                    self._debug(f"pip-audit found {len(audit_data['vulnerabilities'])} vulnerabilities")
-                    for vuln in audit_data["vulnerabilities"]:
-                        vulnerabilities.append({
-                            "package": vuln.get("name", ""),
-                            "installed_version": vuln.get("installed_version", ""),
-                            "vulnerable_spec": vuln.get("vulnerable_spec", ""),
-                            "severity": self._map_cvss_severity(vuln.get("cvss", {}).get("score", 0)),
-                            "cve": vuln.get("id", ""),
-                            "cvss_score": vuln.get("cvss", {}).get("score", 0),
-                            "scanner": "pip-audit",
-                        })
-                else:
-                    self._debug("No 'vulnerabilities' key in pip-audit output")
-                
-                return {"vulnerabilities": vulnerabilities}
-            else:
-                self._debug(f"pip-audit failed with exit code {result.returncode}")
-                self._debug(f"pip-audit stderr: {result.stderr[:500] if result.stderr else 'None'}")
-        except FileNotFoundError:
-            self._debug("pip-audit command not found")
-        except subprocess.TimeoutExpired:
-            self._debug("pip-audit timed out after 300 seconds")
-        except json.JSONDecodeError as e:
-            self._debug(f"Failed to parse pip-audit JSON: {str(e)}")
-            self._debug(f"pip-audit stdout (first 500 chars): {result.stdout[:500] if 'result' in locals() else 'N/A'}")
-        except Exception as e:
-            self._debug(f"pip-audit failed with exception: {type(e).__name__}: {str(e)}")
-        
-        return None
+        return _SNYK_SEVERITIES.get(severity) or _SNYK_SEVERITIES.get(severity.lower(), severity.lower())
     
     def _run_sonarqube(self) -> Optional[Dict[str, Any]]:
         """Check for SonarQube results if available"""
@@ -542,7 +734,7 @@ class SecurityAnalyzer:
         
         for report_path in sonar_reports:
             self._debug(f"Checking for SonarQube report at: {report_path}")
-            if report_path.exists():
+            if self._report_stat(report_path) is not None:
                 self._debug(f"Found SonarQube report at: {report_path}")
                 try:
                     # SonarQube integration would require API access
@@ -569,33 +761,26 @@ class SecurityAnalyzer:
         
         for result_path in codeql_results:
             self._debug(f"Checking for CodeQL results at: {result_path}")
-            if result_path.exists():
+            result_stat = self._report_stat(result_path)
+            if result_stat is not None:
                 self._debug(f"Found CodeQL results at: {result_path}")
                 try:
-                    if result_path.is_file():
+                    if stat.S_ISREG(result_stat.st_mode):
                         self._debug("Reading CodeQL results file...")
-                        with open(result_path, 'r') as f:
-                            codeql_data = json.load(f)
-                            # Parse CodeQL results format
-                            vulnerabilities = []
-                            if "runs" in codeql_data:
-                                self._debug(f"Found {len(codeql_data['runs'])} runs in CodeQL results")
-                                for run in codeql_data["runs"]:
-                                    if "results" in run:
-                                        results_count = len(run["results"])
-                                        self._debug(f"Processing {results_count} results in CodeQL run")
-                                        for result in run["results"]:
-                                            rule = result.get("rule", {})
-                                            severity = rule.get("severity", "unknown").lower()
-                                            vulnerabilities.append({
-                                                "rule_id": rule.get("id", ""),
-                                                "severity": severity,
-                                                "message": result.get("message", {}).get("text", ""),
-                                                "location": result.get("locations", [{}])[0].get("physicalLocation", {}),
-                                                "scanner": "codeql",
-                                            })
-                                self._debug(f"CodeQL found {len(vulnerabilities)} vulnerabilities")
-                            return {"vulnerabilities": vulnerabilities}
+                        # SARIF results are read one at a time (streamed for large reports)
+                        vulnerabilities = []
+                        for result in json_utils.iter_items(result_path, "runs.item.results.item"):
+                            rule = result.get("rule", {})
+                            severity = rule.get("severity", "unknown").lower()
+                            vulnerabilities.append({
+                                "rule_id": rule.get("id", ""),
+                                "severity": severity,
+                                "message": result.get("message", {}).get("text", ""),
+                                "location": result.get("locations", [{}])[0].get("physicalLocation", {}),
+                                "scanner": "codeql",
+                            })
+                        self._debug(f"CodeQL found {len(vulnerabilities)} vulnerabilities")
+                        return {"vulnerabilities": vulnerabilities}
                 except json.JSONDecodeError as e:
                     self._debug(f"Failed to parse CodeQL JSON: {str(e)}")
                 except Exception as e:
@@ -606,27 +791,15 @@ class SecurityAnalyzer:
     
     def _calculate_summary(self, vulnerabilities: List[Dict[str, Any]]) -> Dict[str, int]:
         """Calculate summary of vulnerabilities by severity"""
-        summary = {
-            "total": len(vulnerabilities),
-            "critical": 0,
-            "high": 0,
-            "medium": 0,
-            "low": 0,
-            "info": 0,
-        }
-        
+        counts = Counter()
         for vuln in vulnerabilities:
-            severity = vuln.get("severity", "unknown").lower()
-            if severity == "critical":
-                summary["critical"] += 1
-            elif severity == "high":
-                summary["high"] += 1
-            elif severity in ["medium", "moderate"]:
-                summary["medium"] += 1
-            elif severity == "low":
-                summary["low"] += 1
-            elif severity == "info":
-                summary["info"] += 1
+            severity = vuln.get("severity", "unknown")
+            # Common spellings hit the table directly; anything else is lowercased first
+            counts[_SEVERITY_BUCKETS.get(severity) or _SEVERITY_BUCKETS.get(severity.lower())] += 1
+        
+        summary = {"total": len(vulnerabilities)}
+        for severity in _SUMMARY_SEVERITIES:
+            summary[severity] = counts[severity]
         
         return summary
     
@@ -637,14 +810,8 @@ class SecurityAnalyzer:
     
     def _map_cvss_severity(self, cvss_score: float) -> str:
         """Map CVSS score to severity"""
-        if cvss_score >= 9.0:
-            return "critical"
-        elif cvss_score >= 7.0:
-            return "high"
-        elif cvss_score >= 4.0:
-            return "medium"
-        elif cvss_score >= 0.1:
-            return "low"
-        else:
+        if cvss_score != cvss_score:
+            # NaN reaches no bound
             return "info"
+        return _CVSS_SEVERITIES[bisect_right(_CVSS_BOUNDS, cvss_score)]
 
@@ -1,11 +1,14 @@
 """Tech stack detection module"""
 
 import os
-import json
+from collections import Counter
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 from dataclasses import dataclass
 
+from . import json_utils
+
 
 @dataclass
 class TechStack:
@@ -23,9 +26,64 @@ class TechStack:
 class StackDetector:
     """Detects technology stack from repository structure"""
     
+    # Directories not descended into (dependencies, VCS metadata, caches, build output)
+    SKIP_DIRS = frozenset({
+        'node_modules', '.git', '__pycache__', '.venv', 'venv',
+        'dist', 'build', '.next', 'target',
+    })
+    
+    # File names recorded wherever they appear in the tree
+    KEY_FILES = frozenset({
+        # Node.js ecosystem
+        "package.json",
+        "package-lock.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+        "tsconfig.json",
+        "jsconfig.json",
+        "nest-cli.json",
+        "angular.json",
+        "next.config.js",
+        "next.config.ts",
+        "vite.config.js",
+        "vite.config.ts",
+        "webpack.config.js",
+        "craco.config.js",
+        
+        # React Native
+        "app.json",
+        "metro.config.js",
+        "react-native.config.js",
+        
+        # Python
+        "requirements.txt",
+        "requirements-dev.txt",
+        "setup.py",
+        "pyproject.toml",
+        "Pipfile",
+        "poetry.lock",
+        "manage.py",  # Django
+        "django_settings.py",
+        "fastapi_app.py",
+        "main.py",
+        
+        # Other
+        ".gitignore",
+        "README.md",
+    })
+    
+    # Directory names recorded as markers (React Native native projects)
+    KEY_DIRS = frozenset({'android', 'ios'})
+    
+    # Source extensions counted for language detection
+    LANGUAGE_EXTENSIONS = ('.py', '.js', '.ts', '.jsx', '.tsx')
+    
     def __init__(self, repo_path: str):
         self.repo_path = Path(repo_path)
         self.detected_files: Set[str] = set()
+        # Filled by _scan_files: file counts per language extension, names at the repo root
+        self.ext_counts: Counter = Counter()
+        self.top_level: Set[str] = set()
     
     def detect(self) -> TechStack:
         """Main detection method"""
@@ -66,81 +124,76 @@ class StackDetector:
     
     def _scan_files(self):
         """Scan repository for key files"""
-        key_files = [
-            # Node.js ecosystem
-            "package.json",
-            "package-lock.json",
-            "yarn.lock",
-            "pnpm-lock.yaml",
-            "tsconfig.json",
-            "jsconfig.json",
-            "nest-cli.json",
-            "angular.json",
-            "next.config.js",
-            "next.config.ts",
-            "vite.config.js",
-            "vite.config.ts",
-            "webpack.config.js",
-            "craco.config.js",
-            
-            # React Native
-            "app.json",
-            "metro.config.js",
-            "react-native.config.js",
-            "android/",
-            "ios/",
-            
-            # Python
-            "requirements.txt",
-            "requirements-dev.txt",
-            "setup.py",
-            "pyproject.toml",
-            "Pipfile",
-            "poetry.lock",
-            "manage.py",  # Django
-            "django_settings.py",
-            "fastapi_app.py",
-            "main.py",
-            
-            # Other
-            ".gitignore",
-            "README.md",
-        ]
-        
-        for root, dirs, files in os.walk(self.repo_path):
-            # Skip common ignore patterns
-            if any(skip in root for skip in ['node_modules', '.git', '__pycache__', '.venv', 'venv']):
+        
+        skip_dirs = self.SKIP_DIRS
+        key_files = self.KEY_FILES
+        key_dirs = self.KEY_DIRS
+        lang_exts = self.LANGUAGE_EXTENSIONS
+        ext_counts = self.ext_counts
+        
+        # Single walk feeding every detector; entries are (directory, path relative to the repo)
+        stack = [(str(self.repo_path), "")]
+        while stack:
+            current, rel_dir = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if not rel_dir:
+                            self.top_level.add(name)
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                # Prune ignored directories instead of walking and discarding them
+                                if name not in skip_dirs:
+                                    sub_dir = rel_dir + name + os.sep
+                                    if name in key_dirs:
+                                        self.detected_files.add(sub_dir)
+                                    stack.append((entry.path, sub_dir))
+                                continue
+                        except OSError:
+                            continue
+                        
+                        if name.endswith(lang_exts):
+                            ext_counts[name[name.rindex('.'):]] += 1
+                        
+                        if name in key_files:
+                            self.detected_files.add(rel_dir + name)
+            except OSError:
+                # Directory vanished or is unreadable
                 continue
-            
-            for file in files:
-                file_path = Path(root) / file
-                rel_path = file_path.relative_to(self.repo_path)
-                
-                if any(key_file in str(rel_path) for key_file in key_files):
-                    self.detected_files.add(str(rel_path))
+    
+    @cached_property
+    def _package_json(self) -> Dict[str, Any]:
+        """Root package.json, parsed once for every detector ({} if absent or invalid)"""
+        if "package.json" not in self.top_level:
+            return {}
+        try:
+            data = json_utils.load_file(self.repo_path / "package.json")
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    @cached_property
+    def _deps(self) -> Dict[str, Any]:
+        """dependencies and devDependencies of package.json merged"""
+        deps = {}
+        for key in ("dependencies", "devDependencies"):
+            section = self._package_json.get(key)
+            if isinstance(section, dict):
+                deps.update(section)
+        return deps
     
     def _detect_primary_language(self) -> str:
         """Detect primary programming language"""
+        counts = self.ext_counts
+        
         # Check for Python files
-        python_files = list(self.repo_path.rglob("*.py"))
-        if python_files and not any("node_modules" in str(p) for p in python_files):
+        if counts[".py"]:
             return "Python"
         
         # Check for JavaScript/TypeScript files
-        js_files = list(self.repo_path.rglob("*.js"))
-        ts_files = list(self.repo_path.rglob("*.ts"))
-        jsx_files = list(self.repo_path.rglob("*.jsx"))
-        tsx_files = list(self.repo_path.rglob("*.tsx"))
-        
-        if js_files or ts_files or jsx_files or tsx_files:
-            # Filter out node_modules
-            js_files = [f for f in js_files if "node_modules" not in str(f)]
-            ts_files = [f for f in ts_files if "node_modules" not in str(f)]
-            jsx_files = [f for f in jsx_files if "node_modules" not in str(f)]
-            tsx_files = [f for f in tsx_files if "node_modules" not in str(f)]
-            
-            if js_files or ts_files or jsx_files or tsx_files:
-                return "JavaScript"
+        if counts[".js"] or counts[".ts"] or counts[".jsx"] or counts[".tsx"]:
+            return "JavaScript"
         
         return "Unknown"
     
@@ -149,128 +202,167 @@ class StackDetector:
         frameworks = []
         
         # Check package.json for dependencies
-        package_json = self.repo_path / "package.json"
-        if package_json.exists():
-            try:
-                with open(package_json, 'r') as f:
-                    pkg_data = json.load(f)
-                    deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
-                    
-                    # NestJS
-                    if "@nestjs/core" in deps or "@nestjs/common" in deps:
-                        frameworks.append("NestJS")
-                    
-                    # React
-                    if "react" in deps:
-                        frameworks.append("React")
-                    
-                    # Next.js
-                    if "next" in deps:
-                        frameworks.append("Next.js")
-                    
-                    # Angular
-                    if "@angular/core" in deps:
-                        frameworks.append("Angular")
-                    
-                    # Vue
-                    if "vue" in deps:
-                        frameworks.append("Vue")
-                    
-                    # React Native
-                    if "react-native" in deps:
-                        frameworks.append("React Native")
-                    
-                    # Express
-                    if "express" in deps:
-                        frameworks.append("Express")
-            except Exception:
-                pass
+        deps = self._deps
+        
+        # NestJS
+        if "@nestjs/core" in deps or "@nestjs/common" in deps:
+            frameworks.append("NestJS")
+        
+        # React
+        if "react" in deps:
+            frameworks.append("React")
+        
+        # Next.js
+        if "next" in deps:
+            frameworks.append("Next.js")
+        
+        # Angular
+        if "@angular/core" in deps:
+            frameworks.append("Angular")
+        
+        # Vue
+        if "vue" in deps:
+            frameworks.append("Vue")
+        
+        # React Native
+        if "react-native" in deps:
+            frameworks.append("React Native")
+        
+        # Express
+        if "express" in deps:
+            frameworks.append("Express")
         
         # Check for NestJS CLI config
-        if (self.repo_path / "nest-cli.json").exists():
+        if "nest-cli.json" in self.top_level:
             if "NestJS" not in frameworks:
                 frameworks.append("NestJS")
         
         # Check for Django
-        if (self.repo_path / "manage.py").exists():
+        if "manage.py" in self.top_level:
             frameworks.append("Django")
         
         # Check for FastAPI
-        fastapi_files = list(self.repo_path.rglob("*fastapi*.py"))
-        if fastapi_files:
+        if self._uses_python_package("fastapi"):
             frameworks.append("FastAPI")
         
         # Check for Flask
-        flask_files = list(self.repo_path.rglob("*flask*.py"))
-        if flask_files:
+        if self._uses_python_package("flask"):
             frameworks.append("Flask")
         
         return frameworks
     
+    @cached_property
+    def _python_requirements(self) -> Optional[str]:
+        """Lower-cased dependency specs from requirements.txt and pyproject.toml (None if neither exists)"""
+        top_level = self.top_level
+        if "requirements.txt" not in top_level and "pyproject.toml" not in top_level:
+            return None
+        
+        specs = []
+        if "requirements.txt" in top_level:
+            try:
+                specs.append((self.repo_path / "requirements.txt").read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                pass
+        
+        if "pyproject.toml" in top_level:
+            try:
+                # Try Python 3.11+ built-in tomllib first
+                try:
+                    import tomllib
+                except ImportError:
+                    # Fallback to tomli for older Python versions
+                    import tomli as tomllib
+                with open(self.repo_path / "pyproject.toml", 'rb') as f:
+                    pyproject_data = tomllib.load(f)
+                
+                project = pyproject_data.get("project", {})
+                specs.extend(project.get("dependencies", []))
+                for deps in project.get("optional-dependencies", {}).values():
+                    specs.extend(deps)
+                # Poetry keys dependencies by name
+                specs.extend(pyproject_data.get("tool", {}).get("poetry", {}).get("dependencies", {}))
+            except Exception:
+                pass
+        
+        return "\n".join(spec for spec in specs if isinstance(spec, str)).lower()
+    
+    def _uses_python_package(self, package: str) -> bool:
+        """Check the declared dependencies, or without a manifest, file names near the root"""
+        requirements = self._python_requirements
+        if requirements is not None:
+            return package in requirements
+        return self._has_near_root(f"*{package}*.py")
+    
+    def _has_near_root(self, pattern: str) -> bool:
+        """Whether a file matching the glob sits at the root or one directory below it"""
+        if any(True for _ in self.repo_path.glob(pattern)):
+            return True
+        return any(path.parent.name not in self.SKIP_DIRS for path in self.repo_path.glob("*/" + pattern))
+    
     def _detect_package_manager(self) -> Optional[str]:
         """Detect package manager"""
-        if (self.repo_path / "pnpm-lock.yaml").exists():
+        top_level = self.top_level
+        if "pnpm-lock.yaml" in top_level:
             return "pnpm"
-        elif (self.repo_path / "yarn.lock").exists():
+        elif "yarn.lock" in top_level:
             return "yarn"
-        elif (self.repo_path / "package-lock.json").exists():
+        elif "package-lock.json" in top_level:
             return "npm"
-        elif (self.repo_path / "package.json").exists():
+        elif "package.json" in top_level:
             return "npm"  # Default to npm if package.json exists
-        elif (self.repo_path / "requirements.txt").exists() or (self.repo_path / "pyproject.toml").exists():
+        elif "requirements.txt" in top_level or "pyproject.toml" in top_level:
             return "pip"
-        elif (self.repo_path / "Pipfile").exists():
+        elif "Pipfile" in top_level:
             return "pipenv"
-        elif (self.repo_path / "poetry.lock").exists():
+        elif "poetry.lock" in top_level:
             return "poetry"
         
         return None
     
     def _detect_build_tool(self) -> Optional[str]:
         """Detect build tool"""
+        top_level = self.top_level
+        
         # Webpack
-        if (self.repo_path / "webpack.config.js").exists() or (self.repo_path / "webpack.config.ts").exists():
+        if "webpack.config.js" in top_level or "webpack.config.ts" in top_level:
             return "webpack"
         
         # Vite
-        if (self.repo_path / "vite.config.js").exists() or (self.repo_path / "vite.config.ts").exists():
+        if "vite.config.js" in top_level or "vite.config.ts" in top_level:
             return "vite"
         
         # Next.js (has built-in build)
-        if (self.repo_path / "next.config.js").exists() or (self.repo_path / "next.config.ts").exists():
+        if "next.config.js" in top_level or "next.config.ts" in top_level:
             return "next"
         
         # Create React App
-        if (self.repo_path / "craco.config.js").exists():
+        if "craco.config.js" in top_level:
             return "craco"
         
         # Check package.json scripts
-        package_json = self.repo_path / "package.json"
-        if package_json.exists():
-            try:
-                with open(package_json, 'r') as f:
-                    pkg_data = json.load(f)
-                    scripts = pkg_data.get("scripts", {})
-                    if "build" in scripts:
-                        # Try to infer from build script
-                        build_cmd = scripts.get("build", "")
-                        if "webpack" in build_cmd:
-                            return "webpack"
-                        elif "vite" in build_cmd:
-                            return "vite"
-            except Exception:
-                pass
+        scripts = self._package_json.get("scripts")
+        if isinstance(scripts, dict):
+            # Try to infer from build script
+            build_cmd = scripts.get("build")
+            if isinstance(build_cmd, str):
+                if "webpack" in build_cmd:
+                    return "webpack"
+                elif "vite" in build_cmd:
+                    return "vite"
         
         return None
     
     def _detect_runtime(self) -> Optional[str]:
         """Detect runtime environment"""
+        top_level = self.top_level
+        
         # Node.js
-        if (self.repo_path / "package.json").exists():
+        if "package.json" in top_level:
             return "Node.js"
         
         # Python
-        if (self.repo_path / "requirements.txt").exists() or (self.repo_path / "pyproject.toml").exists():
+        if "requirements.txt" in top_level or "pyproject.toml" in top_level:
             return "Python"
         
         return None
@@ -278,42 +370,26 @@ class StackDetector:
     def _has_typescript(self) -> bool:
         """Check if project uses TypeScript"""
         # Check for tsconfig.json
-        if (self.repo_path / "tsconfig.json").exists():
+        if "tsconfig.json" in self.top_level:
             return True
         
         # Check for .ts/.tsx files
-        ts_files = list(self.repo_path.rglob("*.ts"))
-        tsx_files = list(self.repo_path.rglob("*.tsx"))
-        
-        # Filter out node_modules
-        ts_files = [f for f in ts_files if "node_modules" not in str(f)]
-        tsx_files = [f for f in tsx_files if "node_modules" not in str(f)]
-        
-        return len(ts_files) > 0 or len(tsx_files) > 0
+        return self.ext_counts[".ts"] > 0 or self.ext_counts[".tsx"] > 0
     
     def _is_mobile(self) -> bool:
         """Check if project is mobile (React Native)"""
+        top_level = self.top_level
+        
         # Check for React Native specific files
-        if (self.repo_path / "app.json").exists():
+        if "app.json" in top_level:
             return True
         
-        if (self.repo_path / "android").exists() or (self.repo_path / "ios").exists():
+        if "android" in top_level or "ios" in top_level:
             return True
         
-        if (self.repo_path / "metro.config.js").exists():
+        if "metro.config.js" in top_level:
             return True
         
         # Check package.json for react-native
-        package_json = self.repo_path / "package.json"
-        if package_json.exists():
-            try:
-                with open(package_json, 'r') as f:
-                    pkg_data = json.load(f)
-                    deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
-                    if "react-native" in deps:
-                        return True
-            except Exception:
-                pass
-        
-        return False
+        return "react-native" in self._deps
 
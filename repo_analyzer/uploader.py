@@ -1,20 +1,40 @@
 """Upload module for evidence packs to external platforms"""
 
+import gzip
 import os
+import tempfile
+import time
 import zipfile
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from datetime import datetime, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
 
+from . import json_utils
+
+# ZIPs up to this size are built in memory; larger ones spill to an anonymous temp file
+ZIP_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+# Already-compressed formats are stored as-is: deflating them costs CPU for no gain
+STORED_SUFFIXES = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.zip', '.gz'})
+
+# Non text/* content types gzipped on per-file upload when gzip_text is enabled
+GZIP_CONTENT_TYPES = frozenset({'application/json', 'application/xml', 'application/x-yaml'})
+
 
 class EvidenceUploader:
     """Uploads evidence packs to external compliance platforms"""
     
     def __init__(self, upload_url: str, upload_token: str, 
-                 auth_type: str = "bearer", custom_header: Optional[str] = None):
+                 auth_type: str = "bearer", custom_header: Optional[str] = None,
+                 max_workers: int = 8, compresslevel: int = 1, gzip_text: bool = False,
+                 pool_size: Optional[int] = None, request_timeout: float = 60.0,
+                 zip_timeout: float = 300.0, retry_total: int = 3):
         """
         Initialize uploader
         
@@ -23,11 +43,36 @@ class EvidenceUploader:
             upload_token: Authentication token
             auth_type: Type of auth - "bearer", "sas", "custom"
             custom_header: Custom header name if auth_type is "custom" (e.g., "X-API-Key")
+            max_workers: Concurrent PUTs for the "individual" upload method
+            compresslevel: Deflate level (1-9) for the ZIP and for gzip_text
+            gzip_text: Send text files gzip-encoded in the "individual" upload method
+                (the endpoint must accept Content-Encoding: gzip)
+            pool_size: Keep-alive connections per host (default: 2 x max_workers)
+            request_timeout: Timeout in seconds for each per-file PUT
+            zip_timeout: Timeout in seconds for the ZIP POST
+            retry_total: Retries on connection errors and 502/503/504 responses
         """
         self.upload_url = upload_url.rstrip('/')
         self.upload_token = upload_token
         self.auth_type = auth_type.lower()
         self.custom_header = custom_header or "X-API-Key"
+        self.max_workers = max(1, max_workers)
+        self.compresslevel = compresslevel
+        self.gzip_text = gzip_text
+        self.pool_size = pool_size or self.max_workers * 2
+        self.request_timeout = request_timeout
+        self.zip_timeout = zip_timeout
+        self.retry_total = retry_total
+        
+        # One keep-alive pool for every request, large enough for all upload workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.pool_size,
+            max_retries=Retry(total=self.retry_total, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def upload(self, evidence_dir: Path, repo_name: str, commit_sha: str,
                upload_method: str = "zip") -> Dict[str, Any]:
@@ -50,63 +95,64 @@ class EvidenceUploader:
     
     def _upload_as_zip(self, evidence_dir: Path, repo_name: str, commit_sha: str) -> Dict[str, Any]:
         """Upload evidence pack as a single ZIP file"""
-        # Create ZIP file
-        zip_path = evidence_dir.parent / f"evidence-{repo_name}-{commit_sha[:7]}.zip"
+        zip_name = f"evidence-{repo_name}-{commit_sha[:7]}.zip"
         
-        try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add all files from evidence directory
-                for file_path in evidence_dir.rglob('*'):
-                    if file_path.is_file():
-                        arcname = file_path.relative_to(evidence_dir)
-                        zipf.write(file_path, arcname)
-            
-            zip_size = zip_path.stat().st_size
-            
-            # Construct upload path
-            upload_path = f"/evidence/{repo_name}/{commit_sha}"
-            upload_endpoint = urljoin(self.upload_url, upload_path)
-            
-            # Prepare headers
-            headers = self._get_headers()
-            
-            # Upload ZIP file
-            with open(zip_path, 'rb') as f:
-                files = {'file': (zip_path.name, f, 'application/zip')}
-                data = {
-                    'repo_name': repo_name,
-                    'commit_sha': commit_sha,
-                    'uploaded_at': datetime.now(timezone.utc).isoformat(),
-                }
-                
-                response = requests.post(
-                    upload_endpoint,
-                    headers=headers,
-                    files=files,
-                    data=data,
-                    timeout=300  # 5 minute timeout for large files
-                )
-                response.raise_for_status()
-            
-            # Get published URL from response or construct it
-            published_url = self._extract_published_url(response, upload_path)
-            
-            # Clean up ZIP file
-            zip_path.unlink()
-            
-            return {
-                "success": True,
-                "published_url": published_url,
-                "upload_method": "zip",
-                "file_size": zip_size,
-                "upload_endpoint": upload_endpoint,
-            }
-            
-        except Exception as e:
-            # Clean up ZIP file on error
-            if zip_path.exists():
-                zip_path.unlink()
-            raise Exception(f"Failed to upload ZIP: {str(e)}")
+        # Build the ZIP in memory (spilling to a temp file only for large packs) so it
+        # is not written next to the evidence and read back
+        with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_BYTES) as buf:
+            try:
+                return self._post_zip(buf, zip_name, evidence_dir, repo_name, commit_sha)
+            except Exception as e:
+                raise Exception(f"Failed to upload ZIP: {str(e)}")
+    
+    def _post_zip(self, buf, zip_name: str, evidence_dir: Path, repo_name: str,
+                  commit_sha: str) -> Dict[str, Any]:
+        """Write the evidence ZIP into buf and POST it"""
+        with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            # Add all files from evidence directory
+            for arcname, entry in self._iter_evidence_files(evidence_dir):
+                if os.path.splitext(entry.name)[1].lower() in STORED_SUFFIXES:
+                    zipf.write(entry.path, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zipf.write(entry.path, arcname, compresslevel=self.compresslevel)
+        
+        zip_size = buf.tell()
+        buf.seek(0)
+        
+        # Construct upload path
+        upload_path = f"/evidence/{repo_name}/{commit_sha}"
+        upload_endpoint = urljoin(self.upload_url, upload_path)
+        
+        # Prepare headers
+        headers = self._get_headers()
+        
+        # Upload ZIP file
+        files = {'file': (zip_name, buf, 'application/zip')}
+        data = {
+            'repo_name': repo_name,
+            'commit_sha': commit_sha,
+            'uploaded_at': datetime.now(timezone.utc).isoformat(),
+        }
+        
+        response = self.session.post(
+            upload_endpoint,
+            headers=headers,
+            files=files,
+            data=data,
+            timeout=self.zip_timeout
+        )
+        response.raise_for_status()
+        
+        # Get published URL from response or construct it
+        published_url = self._extract_published_url(response, upload_path)
+        
+        return {
+            "success": True,
+            "published_url": published_url,
+            "upload_method": "zip",
+            "file_size": zip_size,
+            "upload_endpoint": upload_endpoint,
+        }
     
     def _upload_individual_files(self, evidence_dir: Path, repo_name: str, commit_sha: str) -> Dict[str, Any]:
         """Upload evidence pack files individually"""
@@ -118,33 +164,19 @@ class EvidenceUploader:
         failed_files = []
         
         # Get all files
-        files_to_upload = list(evidence_dir.rglob('*'))
-        files_to_upload = [f for f in files_to_upload if f.is_file()]
+        files_to_upload = list(self._iter_evidence_files(evidence_dir))
         
-        for file_path in files_to_upload:
-            try:
-                relative_path = file_path.relative_to(evidence_dir)
-                file_url = urljoin(base_url, str(relative_path).replace('\\', '/'))
-                
-                with open(file_path, 'rb') as f:
-                    file_headers = headers.copy()
-                    file_headers['Content-Type'] = self._get_content_type(file_path)
-                    
-                    response = requests.put(
-                        file_url,
-                        headers=file_headers,
-                        data=f,
-                        timeout=60
-                    )
-                    response.raise_for_status()
-                
-                uploaded_files.append(str(relative_path))
-                
-            except Exception as e:
-                failed_files.append({
-                    "file": str(relative_path),
-                    "error": str(e)
-                })
+        # Uploads are network-bound: run the PUTs concurrently, reporting in file order
+        put_one = partial(self._put_one, base_url=base_url, headers=headers)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for relative_path, error in executor.map(put_one, files_to_upload):
+                if error is None:
+                    uploaded_files.append(relative_path)
+                else:
+                    failed_files.append({
+                        "file": relative_path,
+                        "error": str(error)
+                    })
         
         if failed_files:
             return {
@@ -163,6 +195,34 @@ class EvidenceUploader:
             "upload_method": "individual",
         }
     
+    def _put_one(self, item: Tuple[str, os.DirEntry], base_url: str,
+                 headers: Dict[str, str]) -> Tuple[str, Optional[Exception]]:
+        """PUT a single (relative path, DirEntry) evidence file; returns (relative path, error or None)"""
+        relative_path, entry = item
+        try:
+            file_url = urljoin(base_url, relative_path)
+            
+            with open(entry.path, 'rb') as f:
+                content_type = self._get_content_type(Path(entry.path))
+                file_headers = headers.copy()
+                file_headers['Content-Type'] = content_type
+                
+                body = f
+                if self.gzip_text and (content_type.startswith('text/') or content_type in GZIP_CONTENT_TYPES):
+                    body = gzip.compress(f.read(), compresslevel=self.compresslevel)
+                    file_headers['Content-Encoding'] = 'gzip'
+                
+                response = self.session.put(
+                    file_url,
+                    headers=file_headers,
+                    data=body,
+                    timeout=self.request_timeout
+                )
+                response.raise_for_status()
+        except Exception as e:
+            return relative_path, e
+        return relative_path, None
+    
     def _get_headers(self) -> Dict[str, str]:
         """Get authentication headers based on auth type"""
         headers = {
@@ -222,30 +282,45 @@ class EvidenceUploader:
             # Fallback to constructed URL
             return urljoin(self.upload_url, default_path)
     
+    @staticmethod
+    def _iter_evidence_files(evidence_dir: Path) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Yield (POSIX path relative to evidence_dir, DirEntry) for every file in the pack.
+        
+        Shared by the ZIP, per-file and manifest paths. Not cached: the pack can change
+        between calls (upload_manifest itself adds manifest.json).
+        """
+        stack = [(str(evidence_dir), "")]
+        while stack:
+            current, rel_dir = stack.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel_dir + entry.name + "/"))
+                    elif entry.is_file():
+                        yield rel_dir + entry.name, entry
+    
     def upload_manifest(self, evidence_dir: Path, repo_name: str, commit_sha: str) -> Optional[str]:
         """Upload a manifest file describing the evidence pack structure"""
         manifest = {
             "repo_name": repo_name,
             "commit_sha": commit_sha,
-            "uploaded_at": datetime.utcnow().isoformat() + 'Z',
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
             "files": []
         }
         
         # List all files
-        for file_path in evidence_dir.rglob('*'):
-            if file_path.is_file():
-                relative_path = file_path.relative_to(evidence_dir)
-                file_stat = file_path.stat()
-                manifest["files"].append({
-                    "path": str(relative_path).replace('\\', '/'),
-                    "size": file_stat.st_size,
-                    "modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat() + 'Z',
-                })
+        for relative_path, entry in self._iter_evidence_files(evidence_dir):
+            file_stat = entry.stat()
+            manifest["files"].append({
+                "path": relative_path,
+                "size": file_stat.st_size,
+                # strftime on the epoch seconds; no datetime object per file
+                "modified": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(file_stat.st_mtime)),
+            })
         
         # Write manifest
         manifest_path = evidence_dir / "manifest.json"
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+        json_utils.dump_file(manifest, manifest_path)
         
         return str(manifest_path)
 
@@ -13,12 +13,21 @@ dependencies = [
     "tomli>=2.0.0; python_version < '3.11'",
 ]
 
+# Optional JSON backends (orjson decoding, ijson streaming) - keep in sync with pyproject.toml
+extras = {
+    "fast": [
+        "orjson>=3.0.0",
+        "ijson>=3.0.0",
+    ],
+}
+
 setup(
     name="repo-analyzer",
     version="1.0.2",
     description="Repository analyzer for generating evidence packs",
     packages=find_packages(),
     install_requires=dependencies,
+    extras_require=extras,
     entry_points={
         "console_scripts": [
             "repo-analyzer=repo_analyzer.cli:main",
@@ -0,0 +1,84 @@
+"""Tests for the optional orjson/ijson paths of json_utils"""
+
+import json
+
+import pytest
+
+from repo_analyzer import json_utils
+
+DOC = {"summary": {"total": 3, "name": "scan"}, "results": [{"id": 1}, {"id": 2}], "ok": True}
+
+
+def _write_large(path, doc):
+    """Write doc padded past MMAP_MIN_BYTES so it is streamed or mapped"""
+    padded = dict(doc, padding="x" * json_utils.MMAP_MIN_BYTES)
+    path.write_text(json.dumps(padded), encoding="utf-8")
+    return path
+
+
+def test_orjson_loads_buffer_and_dump_file(tmp_path):
+    pytest.importorskip("orjson")
+    path = tmp_path / "out.json"
+
+    json_utils.dump_file(DOC, path)
+
+    assert path.read_text(encoding="utf-8") == json.dumps(DOC, indent=2)
+    assert json_utils.load_file(_write_large(tmp_path / "large.json", DOC))["summary"] == DOC["summary"]
+    assert json_utils.loads(bytearray(b'{"a": [1, 2.5]}')) == {"a": [1, 2.5]}
+
+
+def test_orjson_invalid_input_raises_decode_error():
+    pytest.importorskip("orjson")
+
+    with pytest.raises(json.JSONDecodeError):
+        json_utils.loads(b'{"a": ')
+
+
+def test_ijson_load_fields_matches_fallback(monkeypatch):
+    pytest.importorskip("ijson")
+    data = json.dumps(DOC).encode()
+    keys = ["summary.total", "summary.name", "ok", "results", "missing"]
+
+    streamed = json_utils.load_fields(data, keys)
+    monkeypatch.setattr(json_utils, "IJSON_AVAILABLE", False)
+    decoded = json_utils.load_fields(data, keys)
+
+    assert streamed == decoded == {"summary.total": 3, "summary.name": "scan", "ok": True}
+
+
+def test_ijson_load_fields_invalid_input_raises_decode_error():
+    pytest.importorskip("ijson")
+
+    with pytest.raises(json.JSONDecodeError):
+        json_utils.load_fields(b'{"ok": tru', ["ok"])
+
+
+def test_ijson_iter_items_streams_large_files(tmp_path, monkeypatch):
+    pytest.importorskip("ijson")
+    path = _write_large(tmp_path / "report.json", DOC)
+
+    def no_full_decode(path):
+        raise AssertionError("large file was decoded instead of streamed")
+
+    monkeypatch.setattr(json_utils, "load_file", no_full_decode)
+
+    assert list(json_utils.iter_items(path, "results.item")) == DOC["results"]
+
+
+def test_ijson_iter_items_invalid_large_file_raises_decode_error(tmp_path):
+    pytest.importorskip("ijson")
+    path = tmp_path / "broken.json"
+    path.write_text('{"results": [{"id": 1}, ' + " " * json_utils.MMAP_MIN_BYTES, encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        list(json_utils.iter_items(path, "results.item"))
+
+
+def test_iter_items_fallback_matches_ijson(tmp_path, monkeypatch):
+    pytest.importorskip("ijson")
+    path = _write_large(tmp_path / "report.json", DOC)
+
+    streamed = list(json_utils.iter_items(path, "results.item"))
+    monkeypatch.setattr(json_utils, "IJSON_AVAILABLE", False)
+
+    assert list(json_utils.iter_items(path, "results.item")) == streamed
@@ -0,0 +1,38 @@
+"""Tests for the test-runner output parsers of QualityAnalyzer"""
+
+import time
+
+from repo_analyzer.quality_analyzer import QualityAnalyzer
+
+
+def test_pytest_summary_footer():
+    output = b"collected 6 items\n\n==== 1 failed, 3 passed, 2 skipped in 0.12s ====\n"
+
+    result = QualityAnalyzer._parse_pytest_output(output)
+
+    assert result == {"total": 6, "passed": 3, "failed": 1, "skipped": 2, "duration": 0.12}
+
+
+def test_pytest_summary_long_number_line_is_linear():
+    output = b" ".join(str(n).encode() for n in range(10000, 10014)) * 200 + b"\n"
+
+    start = time.monotonic()
+    assert QualityAnalyzer._parse_pytest_output(output) is None
+    assert time.monotonic() - start < 1
+
+
+def test_unittest_expected_failures_are_not_failures():
+    output = b"....\n------\nRan 4 tests in 0.003s\n\nOK (skipped=1, expected failures=1)\n"
+
+    result = QualityAnalyzer._parse_unittest_output(output)
+
+    assert result == {"total": 4, "passed": 3, "failed": 0, "skipped": 1, "duration": 0.003}
+
+
+def test_unittest_failed_counts():
+    output = b"Ran 5 tests in 0.010s\n\nFAILED (failures=1, errors=1, unexpected successes=1)\n"
+
+    result = QualityAnalyzer._parse_unittest_output(output)
+
+    assert result["failed"] == 3
+    assert result["passed"] == 2
@@ -0,0 +1,54 @@
+"""Tests for the maintainability estimators of ScoringSystem"""
+
+from pathlib import Path
+
+import pytest
+
+from repo_analyzer.scoring_system import ScoringSystem
+
+METRICA_PATH = Path(__file__).resolve().parent.parent / "metrica.json"
+
+NESTJS_TS = {"frameworks": ["NestJS"], "has_typescript": True}
+
+
+def _scoring(evidence_dir: Path, stack_info: dict) -> ScoringSystem:
+    """ScoringSystem over an evidence pack without quality/sonar.json"""
+    assert not (evidence_dir / "quality" / "sonar.json").exists()
+    return ScoringSystem(str(evidence_dir), metrica_config_path=str(METRICA_PATH), stack_info=stack_info)
+
+
+def _maintainability_values(scoring: ScoringSystem) -> dict:
+    """Metric values as calculate_scores sees them (source first, then estimator)"""
+    dimension = next(
+        d for d in scoring.metrica_config["scoring_model"]["dimensions"] if d["key"] == "maintainability"
+    )
+    values = {}
+    for metric in dimension["metrics"]:
+        value = scoring._get_metric_value(metric.get("source", {}))
+        if value is None:
+            value = scoring._estimate_metric_value(metric["key"], metric, dimension)
+        values[metric["key"]] = value
+    return values
+
+
+@pytest.mark.parametrize("stack_info, rating, duplication", [
+    (NESTJS_TS, "B", 3),
+    ({}, "C", 8),
+])
+def test_sonar_estimators_fire_without_sonar_report(tmp_path, stack_info, rating, duplication):
+    values = _maintainability_values(_scoring(tmp_path, stack_info))
+
+    assert values["sonar_maintainability_rating"] == rating
+    assert values["duplication_pct"] == duplication
+
+
+@pytest.mark.parametrize("stack_info, expected", [
+    # 0.3 * B(85) + 0.3 * 3%(95) + 0.4 * coverage(100)
+    (NESTJS_TS, 94.0),
+    # 0.3 * C(65) + 0.3 * 8%(85) + 0.4 * coverage(100)
+    ({}, 85.0),
+])
+def test_maintainability_dimension_score(tmp_path, stack_info, expected):
+    result = _scoring(tmp_path, stack_info).calculate_scores("repo", "abc123")
+
+    assert result["scores"]["maintainability"] == pytest.approx(expected)